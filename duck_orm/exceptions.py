@@ -11,3 +11,8 @@ class UpdateException(Exception):
 class IdInvalidException(Exception):
     def __init__(self, *args, **kwargs):
         super(IdInvalidException, self).__init__(*args, **kwargs)
+
+
+class LazyLoadException(Exception):
+    def __init__(self, *args, **kwargs):
+        super(LazyLoadException, self).__init__(*args, **kwargs)
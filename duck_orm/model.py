@@ -1,15 +1,27 @@
-import inspect
-from typing import Any, Dict, List, Mapping, Tuple, Type, TypeVar
+from itertools import islice
+from typing import Any, AsyncIterator, Dict, Iterable, List, Mapping, Tuple, Type, TypeVar
 
 from databases import Database
 
 from duck_orm.exceptions import IdInvalidException, UpdateException
+from duck_orm.schema import ModelSchema
+from duck_orm.session import Session
 from duck_orm.sql import fields as fields_type
-from duck_orm.sql.condition import Condition
+from duck_orm.sql.cache import ResultCache, invalidate_table
+from duck_orm.sql.condition import Condition, compile_conditions
+from duck_orm.sql.expression import Count, Expression, compile_set
+from duck_orm.sql.fields import LoadingEnum
 from duck_orm.utils.functions import get_dialect
 
 T = TypeVar("T", bound="Model")
 
+RELATED_CHUNK_SIZE = 500
+SAVE_MANY_BATCH_SIZE = 500
+MAX_SQL_PARAMETERS = 999
+ITERATE_BATCH_SIZE = 1000
+PAGE_SIZE = 100
+COPY_BATCH_SIZE = 5000
+
 
 class ModelMeta(type):
     def __new__(cls, name, bases, attrs):
@@ -25,13 +37,23 @@ class ModelMeta(type):
 
         return model_class
 
+    def __setattr__(cls, name, value):
+        super().__setattr__(name, value)
+        if isinstance(value, fields_type.Column):
+            type.__setattr__(cls, "__schema__", None)
+
 
 class Model(metaclass=ModelMeta):
     __tablename__: str = ""
     __db__: Database
+    __cache__: Dict[str, Any] | bool | None = None
 
     def __init__(self, **kwargs):
         self._instance = {}
+        self._changed = set()
+        self._persisted = False
+        self._prefetched = {}
+        self._managers = {}
 
         for key, value in kwargs.items():
             self._instance[key] = value
@@ -47,26 +69,94 @@ class Model(metaclass=ModelMeta):
         from duck_orm.sql.relationship import ManyToMany, OneToMany
 
         if isinstance(result, (OneToMany, ManyToMany)):
-            result.model_ = self
+            managers = object.__getattribute__(self, "_managers")
+            manager = managers.get(result)
+            if manager is None:
+                manager = managers[result] = result.bind(self)
+            return manager
         return result
 
+    def __setattr__(self, key: str, value: Any) -> None:
+        if key.startswith("_") or (key not in self._instance and self.get_schema().get_field(key) is None):
+            object.__setattr__(self, key, value)
+            return
+
+        self._instance[key] = value
+        self._changed.add(key)
+
     def __getitem__(self, key):
         return getattr(self, key)
 
+    def get_changed_fields(self) -> List[str]:
+        fields = self.get_schema().fields
+        return [name for name in self._changed if name in fields]
+
     @classmethod
     def relationships(cls):
         pass
 
+    @classmethod
+    def __load_relationships(cls) -> None:
+        if not cls.__dict__.get("__relationships_loaded__", False):
+            cls.relationships()
+            type.__setattr__(cls, "__relationships_loaded__", True)
+
+    @classmethod
+    def get_schema(cls) -> ModelSchema:
+        schema = cls.__dict__.get("__schema__")
+        if schema is None:
+            schema = ModelSchema(cls)
+            type.__setattr__(cls, "__schema__", schema)
+        return schema
+
+    @classmethod
+    def get_cache(cls) -> ResultCache | None:
+        if not cls.__cache__:
+            return None
+
+        cache = cls.__dict__.get("__result_cache__")
+        if cache is None:
+            config = cls.__cache__ if isinstance(cls.__cache__, dict) else {}
+            cache = ResultCache(**config)
+            type.__setattr__(cls, "__result_cache__", cache)
+        return cache
+
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        invalidate_table(cls.get_name())
+
+    @staticmethod
+    def __cache_key(sql: str, values: Dict[str, Any]) -> Tuple:
+        return (
+            sql,
+            tuple((name, tuple(value) if isinstance(value, list) else value) for name, value in sorted(values.items())),
+        )
+
+    @classmethod
+    async def __fetch_rows(cls, sql: str, values: Dict[str, Any], tables: Tuple[str, ...] = ()) -> List[Mapping]:
+        cache = cls.get_cache()
+        if cache is None:
+            data = await cls.__db__.fetch_all(query=sql, values=values)
+            return [row._mapping for row in data]
+
+        key = Model.__cache_key(sql, values)
+        found, rows = cache.get(key)
+        if not found:
+            data = await cls.__db__.fetch_all(query=sql, values=values)
+            rows = [row._mapping for row in data]
+            cache.set(key, (cls.get_name(), *tables), rows)
+        return rows
+
     @classmethod
     async def associations(cls) -> None:
-        cls.relationships()
+        cls.__load_relationships()
         sqls: list[str] = []
         dialect = cls.__db__.url.dialect
 
-        for name, field in inspect.getmembers(cls):
-            if isinstance(field, fields_type.Column):
-                from duck_orm.sql.relationship import ForeignKey, OneToOne
+        from duck_orm.sql.relationship import ForeignKey, OneToOne
 
+        for name, field in cls.get_schema().foreign_keys:
+            if isinstance(field, (ForeignKey, OneToOne)):
                 sql = ""
                 if isinstance(field, ForeignKey):
                     field_id = field.model.get_id()[1]
@@ -105,30 +195,9 @@ class Model(metaclass=ModelMeta):
 
     @classmethod
     def __get_create_sql(cls) -> str:
-        fields: List[Tuple[str, str]] = []
-        dialect = cls.__db__.url.dialect
-
-        for name, field in inspect.getmembers(cls):
-            if isinstance(field, fields_type.Column):
-                from duck_orm.sql.relationship import OneToOne
-
-                if isinstance(field, OneToOne):
-                    if not field.model:
-                        raise Exception("Model not found")
-
-                    field_id = field.model.get_id()[1]
-                    table_name = field.model.get_name()
-                    fields.extend(
-                        (
-                            (name, field_id.column_sql(dialect)),
-                            ("", field.create_sql(dialect, name, table_name)),
-                        )
-                    )
-                else:
-                    fields.insert(0, (name, field.column_sql(dialect)))
-
-        fields_config = [" ".join(field) for field in fields]
-        query_executor = get_dialect(str(dialect))
+        dialect = str(cls.__db__.url.dialect)
+        fields_config = list(cls.get_schema().create_fields(dialect))
+        query_executor = get_dialect(dialect)
         return query_executor.create_sql(cls.get_name(), fields_config)
 
     @classmethod
@@ -138,21 +207,15 @@ class Model(metaclass=ModelMeta):
 
     @classmethod
     def __get_fields_all(cls) -> List[str]:
-        cls.relationships()
-        fields_all: List[str] = []
-        for name, field in inspect.getmembers(cls):
-            from duck_orm.sql.relationship import ManyToMany, OneToMany
-
-            if isinstance(field, fields_type.Column) and not isinstance(field, (OneToMany, ManyToMany)):
-                fields_all.append(name)
-        return fields_all
+        cls.__load_relationships()
+        return list(cls.get_schema().fields)
 
     @classmethod
     def get_id(cls):
-        for name, field in inspect.getmembers(cls):
-            if isinstance(field, fields_type.Column) and field.primary_key:
-                return name, field
-        raise IdInvalidException("Model has no primary key!")
+        primary_key = cls.get_schema().primary_key
+        if primary_key is None:
+            raise IdInvalidException("Model has no primary key!")
+        return primary_key
 
     @classmethod
     def __get_select_sql(
@@ -161,45 +224,247 @@ class Model(metaclass=ModelMeta):
         fields_excludes: List[str] = [],
         conditions: List[Condition] = [],
         limit: int | None = None,
-    ) -> tuple[str, list[str]]:
+        select_related: List[str] = [],
+        order_by: List[str] = [],
+        offset: int | None = None,
+        after: Tuple | None = None,
+        annotations: Dict[str, str] | None = None,
+    ) -> tuple[str, list[str], Dict[str, Any]]:
         if not fields_includes:
             fields_includes = cls.__get_fields_all()
-        fields_includes = list(set(fields_includes) - set(fields_excludes))
+        fields_includes = [field for field in dict.fromkeys(fields_includes) if field not in fields_excludes]
 
         query_executor = get_dialect(str(cls.__db__.url.dialect))
-        conditions_str = "1 = 1"
-        if conditions:
-            conditions_str = " and ".join(map(lambda condition: condition.get_condition(), conditions))
+        conditions_str, values = compile_conditions(conditions, query_executor)
+        cls.__validate_order_by(order_by)
+        if after is not None:
+            fields_order_by = [field.lstrip("-") for field in order_by]
+            keyset_str, keyset_values = query_executor.keyset_sql(
+                fields_order_by, after, descending=order_by[0].startswith("-")
+            )
+            conditions_str = " and ".join(filter(None, [conditions_str, keyset_str]))
+            values.update(keyset_values)
+        conditions_str = conditions_str or "1 = 1"
+
+        joins = cls.__get_joins(select_related)
+        fields_joins = [join["name"] for join in joins]
+        if joins:
+            fields_joins.extend(field.lstrip("-") for field in order_by)
+        for field in fields_joins:
+            if field not in fields_includes:
+                fields_includes.append(field)
+
+        sql = query_executor.select_sql(
+            cls.get_name(),
+            fields_includes,
+            conditions_str,
+            limit,
+            joins,
+            order_by=order_by,
+            offset=offset,
+            annotations=annotations,
+        )
+        return sql, fields_includes, values
 
-        sql = query_executor.select_sql(cls.get_name(), fields_includes, conditions_str, limit)
-        return sql, fields_includes
+    @classmethod
+    def __validate_order_by(cls, order_by: List[str]) -> None:
+        cls.__validate_fields(field.lstrip("-") for field in order_by)
 
     @classmethod
-    async def __parser_fields(cls, data: Mapping):
-        fields_all: List[Tuple[str, fields_type.Column | fields_type.Timestamp] | str] = []
-        from duck_orm.sql.relationship import ForeignKey, ManyToOne, OneToMany, OneToOne
+    def __get_joins(cls, select_related: List[str]) -> List[Dict[str, Any]]:
+        cls.__load_relationships()
+        joins: List[Dict[str, Any]] = []
+        foreign_keys = dict(cls.get_schema().foreign_keys)
+        for name in select_related:
+            field = foreign_keys.get(name)
+            if field is None:
+                raise Exception(f"The field {name} is not a relationship of {cls.get_name()}")
+            if not field.model:
+                raise Exception("Model not found")
+
+            joins.append(
+                {
+                    "name": name,
+                    "model": field.model,
+                    "table": field.model.get_name(),
+                    "field": field.model.get_id()[0],
+                    "fields": field.model.__get_fields_all(),
+                }
+            )
+        return joins
+
+    def get_key(self) -> Any:
+        return Model.__related_key(self._instance.get(self.get_id()[0]))
+
+    @staticmethod
+    def __row_value(row: Mapping, name: str) -> Any:
+        try:
+            return row[name]
+        except KeyError:
+            return None
+
+    @staticmethod
+    def __related_key(value: Any) -> Any:
+        from duck_orm.sql.relationship import LazyModel
 
-        fields_foreign_key: Dict[str, OneToMany] = {}
-        for name, field in inspect.getmembers(cls):
-            if isinstance(field, fields_type.Column):
-                if isinstance(field, fields_type.Timestamp):
-                    fields_all.append((name, field))
-                else:
-                    fields_all.append(name)
+        if isinstance(value, Model):
+            return value[value.get_id()[0]]
+        if isinstance(value, LazyModel):
+            return value.key
+        return value
 
-                if isinstance(field, (ManyToOne, OneToOne, ForeignKey)):
-                    if not field.model:
-                        raise Exception("Model not found")
+    @staticmethod
+    def __get_loading(field: fields_type.Column, loading: LoadingEnum | str | None) -> LoadingEnum:
+        return LoadingEnum(loading) if loading is not None else field.loading
 
-                    field_name = field.model.get_id()[0]
-                    condition_with_id = Condition(field_name, "=", data[name])
-                    model_entity = await field.model.find_one(conditions=[condition_with_id])
-                    fields_foreign_key[name] = model_entity
-                elif isinstance(field, OneToMany):
-                    fields_foreign_key[name] = field
+    @classmethod
+    async def __find_related(
+        cls,
+        rows: List[Mapping],
+        loading: LoadingEnum | str | None = None,
+        excludes: Iterable[str] = (),
+    ) -> Dict[str, Dict[Any, Any]]:
+        session = Session.current()
+        related: Dict[str, Dict[Any, Any]] = {}
+        for name, field in cls.get_schema().foreign_keys:
+            if name in excludes or Model.__get_loading(field, loading) is not LoadingEnum.EAGER:
+                continue
+            if not field.model:
+                raise Exception("Model not found")
+
+            keys = list({Model.__row_value(row, name) for row in rows} - {None})
+            field_name = field.model.get_id()[0]
+            entities: Dict[Any, Any] = {}
+            if session is not None:
+                for key in keys:
+                    entity = session.get(field.model, key)
+                    if entity is not None:
+                        entities[key] = entity
+                keys = [key for key in keys if key not in entities]
+            for start in range(0, len(keys), RELATED_CHUNK_SIZE):
+                condition = Condition(field_name, "IN", keys[start : start + RELATED_CHUNK_SIZE])
+                for entity in await field.model.find_all(conditions=[condition]):
+                    entities[Model.__related_key(entity[field_name])] = entity
+            related[name] = entities
+        return related
+
+    @classmethod
+    async def __find_joined(
+        cls,
+        rows: List[Mapping],
+        select_related: List[str],
+        loading: LoadingEnum | str | None = None,
+    ) -> Dict[str, Dict[Any, Any]]:
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        related: Dict[str, Dict[Any, Any]] = {}
+        for join in cls.__get_joins(select_related):
+            name = join["name"]
+            aliases = [(field, query_executor.related_field_alias(name, field)) for field in join["fields"]]
+            rows_related: Dict[Any, Dict[str, Any]] = {}
+            for row in rows:
+                key = Model.__row_value(row, name)
+                if key is None or key in rows_related:
+                    continue
+                row_related = {field: row[alias] for field, alias in aliases}
+                if row_related[join["field"]] is not None:
+                    rows_related[key] = row_related
+
+            entities = await join["model"].__build_entities(list(rows_related.values()), loading=loading)
+            related[name] = dict(zip(rows_related.keys(), entities))
+        return related
+
+    @classmethod
+    async def __parser_fields(
+        cls,
+        data: Mapping,
+        related: Dict[str, Dict[Any, Any]] | None = None,
+        loading: LoadingEnum | str | None = None,
+    ):
+        from duck_orm.sql.relationship import LazyModel
+
+        schema = cls.get_schema()
+        fields_all: Tuple[Tuple[str, fields_type.Column] | str, ...] = schema.parser_fields
+        fields_foreign_key: Dict[str, Any] = {}
+        for name, field in schema.foreign_keys:
+            if related is not None and name in related:
+                fields_foreign_key[name] = related[name].get(Model.__row_value(data, name))
+                continue
+
+            strategy = Model.__get_loading(field, loading)
+            if strategy is LoadingEnum.NONE:
+                fields_foreign_key[name] = Model.__row_value(data, name)
+                continue
+            if strategy is LoadingEnum.LAZY:
+                value = Model.__row_value(data, name)
+                fields_foreign_key[name] = LazyModel(field.model, value) if value is not None else None
+                continue
+
+            if not field.model:
+                raise Exception("Model not found")
+
+            value = Model.__row_value(data, name)
+            if value is None:
+                fields_foreign_key[name] = None
+                continue
+
+            session = Session.current()
+            model_entity = session.get(field.model, value) if session is not None else None
+            if model_entity is None:
+                field_name = field.model.get_id()[0]
+                condition_with_id = Condition(field_name, "=", value)
+                model_entity = await field.model.find_one(conditions=[condition_with_id])
+            fields_foreign_key[name] = model_entity
+
+        for name, field in schema.relations:
+            fields_foreign_key[name] = field
 
         return fields_all, fields_foreign_key
 
+    @classmethod
+    async def __build_entities(
+        cls: Type[T],
+        rows: List[Mapping],
+        batch_relations: bool = True,
+        loading: LoadingEnum | str | None = None,
+        select_related: List[str] = [],
+        preloaded: Dict[str, Dict[Any, Any]] | None = None,
+    ) -> List[T]:
+        session = Session.current()
+        mapped: Dict[int, T] = {}
+        if session is not None:
+            name_id = cls.get_id()[0]
+            for index, row in enumerate(rows):
+                entity = session.get(cls, Model.__row_value(row, name_id))
+                if entity is not None:
+                    mapped[index] = entity
+            rows_load = [row for index, row in enumerate(rows) if index not in mapped]
+        else:
+            rows_load = rows
+
+        related: Dict[str, Dict[Any, Any]] = dict(preloaded or {})
+        if select_related:
+            related.update(await cls.__find_joined(rows_load, select_related, loading))
+        if batch_relations:
+            excludes = [*select_related, *related]
+            related.update(await cls.__find_related(rows_load, loading, excludes=excludes))
+
+        result: List[T] = []
+        dialect = get_dialect(str(cls.__db__.url.dialect))
+        fields = cls.get_schema().fields
+        for index, row in enumerate(rows):
+            if index in mapped:
+                result.append(mapped[index])
+                continue
+
+            fields_all, fields_foreign_key = await cls.__parser_fields(row, related, loading)
+            entity = dialect.parser(row, fields_all, fields_foreign_key)
+            model = cls(**entity)
+            model._persisted = True
+            if session is not None and all(name in entity for name in fields):
+                model = session.register(model)
+            result.append(model)
+        return result
+
     @classmethod
     async def find_all(
         cls: Type[T],
@@ -207,18 +472,65 @@ class Model(metaclass=ModelMeta):
         fields_excludes: List[str] = [],
         conditions: List[Condition] = [],
         limit: int | None = None,
+        batch_relations: bool = True,
+        loading: LoadingEnum | str | None = None,
+        select_related: List[str] = [],
+        order_by: List[str] = [],
+        offset: int | None = None,
+        prefetch: List[str] = [],
+        annotate: Dict[str, Count] = {},
     ):
-        sql, fields_includes = cls.__get_select_sql(fields_includes, fields_excludes, conditions, limit=limit)
-        data = await cls.__db__.fetch_all(sql)
-        result: List[T] = []
-        dialect = get_dialect(str(cls.__db__.url.dialect))
-        for row in data:
-            row_ = row._mapping
-            fields_all, fields_foreign_key = await cls.__parser_fields(row_)
-            entity = dialect.parser(row_, fields_all, fields_foreign_key)
-            result.append(cls(**entity))
+        annotations, tables_annotations = cls.__get_annotations(annotate)
+        sql, fields_includes, values = cls.__get_select_sql(
+            fields_includes,
+            fields_excludes,
+            conditions,
+            limit=limit,
+            select_related=select_related,
+            order_by=order_by,
+            offset=offset,
+            annotations=annotations,
+        )
+        tables = tuple(join["table"] for join in cls.__get_joins(select_related)) + tables_annotations
+        rows = await cls.__fetch_rows(sql, values, tables)
+        entities = await cls.__build_entities(rows, batch_relations, loading, select_related)
+        for row, entity in zip(rows, entities):
+            for name in annotations:
+                setattr(entity, name, row[name])
+        if prefetch:
+            await cls.__prefetch(entities, prefetch, loading)
+        return entities
 
-        return result
+    @classmethod
+    def __get_annotations(cls, annotate: Dict[str, Count]) -> Tuple[Dict[str, str], Tuple[str, ...]]:
+        from duck_orm.sql.relationship import ManyToMany, OneToMany
+
+        cls.__load_relationships()
+        schema = cls.get_schema()
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        annotations: Dict[str, str] = {}
+        tables: List[str] = []
+        for name, annotation in annotate.items():
+            if not isinstance(annotation, Count):
+                raise Exception(f"The annotation {name} is not supported")
+            if not name.isidentifier() or schema.get_field(name) is not None:
+                raise Exception(f"The annotation {name} is not a valid name for {cls.get_name()}")
+
+            field = schema.get_field(annotation.name)
+            if isinstance(field, OneToMany):
+                relation_table = field.model.get_name()
+                relation_field = field.name_in_table_fk
+            elif isinstance(field, ManyToMany):
+                relation_table = field.model_relation.get_name()
+                relation_field = cls.__get_relation_fields(field.model_relation, None)[0]
+            else:
+                raise Exception(f"{annotation.name} is not a OneToMany or ManyToMany field of {cls.get_name()}")
+
+            annotations[name] = query_executor.count_relation_sql(
+                cls.get_name(), cls.get_id()[0], relation_table, relation_field
+            )
+            tables.append(relation_table)
+        return annotations, tuple(tables)
 
     @classmethod
     async def find_one(
@@ -226,18 +538,366 @@ class Model(metaclass=ModelMeta):
         fields_includes: List[str] = [],
         fields_excludes: List[str] = [],
         conditions: List[Condition] = [],
+        batch_relations: bool = True,
+        loading: LoadingEnum | str | None = None,
+        select_related: List[str] = [],
+        order_by: List[str] = [],
     ):
-        sql, fields_includes = cls.__get_select_sql(fields_includes, fields_excludes, conditions, limit=1)
-        data = await cls.__db__.fetch_one(sql)
-        dialect = get_dialect(str(cls.__db__.url.dialect))
+        sql, fields_includes, values = cls.__get_select_sql(
+            fields_includes,
+            fields_excludes,
+            conditions,
+            limit=1,
+            select_related=select_related,
+            order_by=order_by,
+        )
+        tables = tuple(join["table"] for join in cls.__get_joins(select_related))
+        rows = await cls.__fetch_rows(sql, values, tables)
         result: T | None = None
-        if data is not None:
-            data_dict = data._mapping
-            fields_all, fields_foreign_key = await cls.__parser_fields(data_dict)
-            entity = dialect.parser(data_dict, fields_all, fields_foreign_key)
-            result = cls(**entity)
+        if rows:
+            entities = await cls.__build_entities(rows[:1], batch_relations, loading, select_related)
+            result = entities[0]
+        return result
+
+    @classmethod
+    def __get_keyset_order(cls, order_by: List[str]) -> List[str]:
+        name_id = cls.get_id()[0]
+        if name_id in [field.lstrip("-") for field in order_by]:
+            return list(order_by)
+        prefix = "-" if order_by and order_by[0].startswith("-") else ""
+        return [*order_by, prefix + name_id]
+
+    @classmethod
+    def __get_iterate_order(cls, fields: List[str], order_by: List[str]) -> Tuple[List[str], bool]:
+        cls.__validate_order_by(order_by)
+        order_by = cls.__get_keyset_order(order_by)
+        columns = cls.get_schema().columns_map
+        keyset = len({field.startswith("-") for field in order_by}) == 1
+        for field in order_by:
+            name = field.lstrip("-")
+            if name not in fields or not (columns[name].primary_key or columns[name].not_null):
+                keyset = False
+        return order_by, keyset
+
+    @classmethod
+    async def iterate(
+        cls: Type[T],
+        fields_includes: List[str] = [],
+        fields_excludes: List[str] = [],
+        conditions: List[Condition] = [],
+        batch_size: int = ITERATE_BATCH_SIZE,
+        batches: bool = False,
+        loading: LoadingEnum | str | None = None,
+        order_by: List[str] = [],
+    ) -> AsyncIterator[Any]:
+        _, fields_includes, _ = cls.__get_select_sql(fields_includes, fields_excludes, conditions)
+        order_by, keyset = cls.__get_iterate_order(fields_includes, order_by)
+        after: Tuple | None = None
+        offset = 0
+        while True:
+            sql, _, values = cls.__get_select_sql(
+                fields_includes,
+                conditions=conditions,
+                limit=batch_size,
+                order_by=order_by,
+                offset=None if keyset else offset or None,
+                after=after,
+            )
+            data = await cls.__db__.fetch_all(query=sql, values=values)
+            rows = [row._mapping for row in data]
+            if not rows:
+                break
+
+            entities = await cls.__build_entities(rows, loading=loading)
+            if batches:
+                yield entities
+            else:
+                for entity in entities:
+                    yield entity
+
+            if len(rows) < batch_size:
+                break
+            if keyset:
+                after = tuple(rows[-1][field.lstrip("-")] for field in order_by)
+            offset += len(rows)
+
+    @classmethod
+    async def paginate(
+        cls: Type[T],
+        after: Any = None,
+        order_by: List[str] | str | None = None,
+        page_size: int = PAGE_SIZE,
+        fields_includes: List[str] = [],
+        fields_excludes: List[str] = [],
+        conditions: List[Condition] = [],
+        loading: LoadingEnum | str | None = None,
+    ) -> List[T]:
+        if order_by is None:
+            order_by = []
+        elif isinstance(order_by, str):
+            order_by = [order_by]
+        order_by = cls.__get_keyset_order(order_by)
+
+        if len({field.startswith("-") for field in order_by}) > 1:
+            raise Exception("All the fields of order_by must be sorted in the same direction to paginate")
+        if after is not None and not isinstance(after, tuple):
+            after = (after,)
+        if after is not None and len(after) != len(order_by):
+            raise Exception("after must have one value for each field of order_by and the primary key")
+
+        sql, fields_includes, values = cls.__get_select_sql(
+            fields_includes,
+            fields_excludes,
+            conditions,
+            limit=page_size,
+            order_by=order_by,
+            after=after,
+        )
+        rows = await cls.__fetch_rows(sql, values)
+        return await cls.__build_entities(rows, loading=loading)
+
+    @classmethod
+    def __get_conditions_sql(cls, conditions: List[Condition]) -> tuple[str, Dict[str, Any]]:
+        conditions_str, values = compile_conditions(conditions, get_dialect(str(cls.__db__.url.dialect)))
+        return conditions_str or "1 = 1", values
+
+    @classmethod
+    def __get_where_sql(cls, conditions: List[Condition]) -> tuple[str, Dict[str, Any]]:
+        conditions_str, values = compile_conditions(conditions, get_dialect(str(cls.__db__.url.dialect)))
+        if not conditions_str:
+            raise Exception(f"Conditions are required to change the records of {cls.get_name()}")
+        return conditions_str, values
+
+    @classmethod
+    def __validate_fields(cls, fields: Iterable[str]) -> None:
+        cls.__load_relationships()
+        fields_all = cls.get_schema().fields
+        for field in fields:
+            if field not in fields_all:
+                raise Exception(f"The field {field} is not a field of {cls.get_name()}")
+
+    @classmethod
+    async def count(cls, conditions: List[Condition] = []) -> int:
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        conditions_str, values = cls.__get_conditions_sql(conditions)
+        sql = query_executor.count_sql(cls.get_name(), conditions_str)
+        return int(await cls.__db__.fetch_val(query=sql, values=values))
+
+    @classmethod
+    async def exists(cls, conditions: List[Condition] = []) -> bool:
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        conditions_str, values = cls.__get_conditions_sql(conditions)
+        sql = query_executor.exists_sql(cls.get_name(), conditions_str)
+        return bool(await cls.__db__.fetch_val(query=sql, values=values))
+
+    @classmethod
+    async def aggregate(
+        cls,
+        conditions: List[Condition] = [],
+        group_by: List[str] = [],
+        **functions: str | List[str],
+    ) -> Dict[str, Any] | List[Dict[str, Any]]:
+        from duck_orm.sql.sql import AGGREGATE_FUNCTIONS
+
+        aggregates: List[Tuple[str, str]] = []
+        for function, fields in functions.items():
+            if function not in AGGREGATE_FUNCTIONS:
+                raise Exception(f"Aggregate function {function} is not supported")
+            fields = [fields] if isinstance(fields, str) else fields
+            cls.__validate_fields(fields)
+            aggregates.extend((function, field) for field in fields)
+        cls.__validate_fields(group_by)
+
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        conditions_str, values = cls.__get_conditions_sql(conditions)
+        sql = query_executor.aggregate_sql(cls.get_name(), aggregates, conditions_str, group_by)
+        data = await cls.__db__.fetch_all(query=sql, values=values)
+        result = [dict(row._mapping) for row in data]
+        if group_by:
+            return result
+        return result[0]
+
+    @classmethod
+    def __get_values_sql(
+        cls,
+        fields: List[str],
+        conditions: List[Condition],
+        limit: int | None,
+        order_by: List[str],
+        offset: int | None,
+    ):
+        fields = list(fields) or cls.__get_fields_all()
+        cls.__validate_fields(fields)
+        cls.__validate_order_by(order_by)
+
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        conditions_str, values = cls.__get_conditions_sql(conditions)
+        sql = query_executor.select_sql(cls.get_name(), fields, conditions_str, limit, order_by=order_by, offset=offset)
+        columns = cls.get_schema().columns_map
+        converters = query_executor.converters({field: columns[field] for field in fields})
+        return sql, values, fields, converters
+
+    @classmethod
+    async def values(
+        cls,
+        fields: List[str] = [],
+        conditions: List[Condition] = [],
+        limit: int | None = None,
+        order_by: List[str] = [],
+        offset: int | None = None,
+    ) -> List[Dict[str, Any]]:
+        sql, values, fields, converters = cls.__get_values_sql(fields, conditions, limit, order_by, offset)
+        data = await cls.__db__.fetch_all(query=sql, values=values)
+        result = [dict(row._mapping) for row in data]
+        for name, convert in converters.items():
+            for item in result:
+                if item[name] is not None:
+                    item[name] = convert(item[name])
+        return result
+
+    @classmethod
+    async def values_list(
+        cls,
+        fields: List[str] = [],
+        conditions: List[Condition] = [],
+        limit: int | None = None,
+        order_by: List[str] = [],
+        offset: int | None = None,
+        flat: bool = False,
+    ) -> List[Any]:
+        if flat and len(fields) != 1:
+            raise Exception("values_list with flat=True requires exactly one field")
+
+        sql, values, fields, converters = cls.__get_values_sql(fields, conditions, limit, order_by, offset)
+        data = await cls.__db__.fetch_all(query=sql, values=values)
+        result = [tuple(row._mapping.values()) for row in data]
+        if converters:
+            indexes = [(fields.index(name), convert) for name, convert in converters.items()]
+            for position, item in enumerate(result):
+                item_converted = list(item)
+                for index, convert in indexes:
+                    if item_converted[index] is not None:
+                        item_converted[index] = convert(item_converted[index])
+                result[position] = tuple(item_converted)
+        if flat:
+            return [item[0] for item in result]
         return result
 
+    @classmethod
+    def __get_relation_fields(cls, relation: Type["Model"], model: "Model | None") -> Tuple[str, str | None]:
+        relation.__load_relationships()
+        field_related: str | None = None
+        field: str | None = None
+        for name, foreign_key in relation.get_schema().foreign_keys:
+            if foreign_key.primary_key:
+                continue
+            if foreign_key.model is cls:
+                field_related = name
+            elif model is not None and isinstance(model, foreign_key.model):
+                field = name
+
+        if field_related is None or (model is not None and field is None):
+            raise Exception("Model not found")
+        return field_related, field
+
+    @classmethod
+    async def find_by_relation(
+        cls: Type[T],
+        relation: Type["Model"],
+        model: "Model | None" = None,
+        limit: int | None = None,
+        order_by: List[str] = [],
+        offset: int | None = None,
+        loading: LoadingEnum | str | None = None,
+    ) -> List[T]:
+        field_related, field = cls.__get_relation_fields(relation, model)
+        cls.__validate_order_by(order_by)
+        conditions: List[Condition] = []
+        if model is not None and field is not None:
+            conditions.append(Condition(Model.__relation_column(relation, field), "=", model.get_key()))
+
+        sql, values = cls.__get_relation_sql(relation, field_related, conditions, limit, order_by, offset)
+        rows = await cls.__fetch_rows(sql, values, (relation.get_name(),))
+        return await cls.__build_entities(rows, loading=loading)
+
+    @staticmethod
+    def __relation_column(relation: Type["Model"], field: str) -> str:
+        return "{table}.{field}".format(table=relation.get_name(), field=field)
+
+    @classmethod
+    def __get_relation_sql(
+        cls,
+        relation: Type["Model"],
+        field_related: str,
+        conditions: List[Condition],
+        limit: int | None = None,
+        order_by: List[str] = [],
+        offset: int | None = None,
+        relation_key: str | None = None,
+    ) -> Tuple[str, Dict[str, Any]]:
+        conditions_str, values = cls.__get_conditions_sql(conditions)
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        sql = query_executor.select_relation_sql(
+            cls.get_name(),
+            cls.__get_fields_all(),
+            cls.get_id()[0],
+            relation.get_name(),
+            field_related,
+            conditions_str,
+            limit,
+            order_by,
+            offset,
+            relation_key,
+        )
+        return sql, values
+
+    @classmethod
+    async def __prefetch(cls, entities: List[T], prefetch: List[str], loading: LoadingEnum | str | None = None) -> None:
+        from duck_orm.sql.relationship import ManyToMany, OneToMany
+
+        cls.__load_relationships()
+        schema = cls.get_schema()
+        parents = {entity.get_key(): entity for entity in entities if entity.get_key() is not None}
+        keys = list(parents.keys())
+        for name in prefetch:
+            field = schema.get_field(name)
+            if not isinstance(field, (OneToMany, ManyToMany)):
+                raise Exception(f"{name} is not a OneToMany or ManyToMany field of {cls.get_name()}")
+
+            children: Dict[Any, List[Model]] = {key: [] for key in keys}
+            for start in range(0, len(keys), RELATED_CHUNK_SIZE):
+                chunk = keys[start : start + RELATED_CHUNK_SIZE]
+                if isinstance(field, OneToMany):
+                    condition = Condition(field.name_in_table_fk, "IN", chunk)
+                    sql, _, values = field.model.__get_select_sql(conditions=[condition])
+                    rows = await field.model.__fetch_rows(sql, values)
+                    preloaded = {field.name_in_table_fk: parents}
+                    models = await field.model.__build_entities(rows, loading=loading, preloaded=preloaded)
+                    for row, model in zip(rows, models):
+                        children[Model.__row_value(row, field.name_in_table_fk)].append(model)
+                    continue
+
+                field_related, field_key = field.model.__get_relation_fields(field.model_relation, entities[0])
+                alias = get_dialect(str(cls.__db__.url.dialect)).relation_key_alias(field_key)
+                condition = Condition(Model.__relation_column(field.model_relation, field_key), "IN", chunk)
+                sql, values = field.model.__get_relation_sql(
+                    field.model_relation, field_related, [condition], relation_key=field_key
+                )
+                rows = await field.model.__fetch_rows(sql, values, (field.model_relation.get_name(),))
+                models = await field.model.__build_entities(rows, loading=loading)
+                for row, model in zip(rows, models):
+                    children[row[alias]].append(model)
+
+            for key, models in children.items():
+                parents[key]._prefetched[field] = models
+
+    @classmethod
+    async def count_by_relation(cls, relation: Type["Model"], model: "Model | None" = None) -> int:
+        field = cls.__get_relation_fields(relation, model)[1]
+        if model is None or field is None:
+            return await relation.count()
+        return await relation.count([Condition(field, "=", model.get_key())])
+
     @classmethod
     async def find_by_id(
         cls: Type[T],
@@ -245,6 +905,12 @@ class Model(metaclass=ModelMeta):
         fields_includes: List[str] = [],
         fields_excludes: List[str] = [],
     ):
+        session = Session.current()
+        if session is not None and not fields_includes and not fields_excludes:
+            entity = session.get(cls, id)
+            if entity is not None:
+                return entity
+
         name = cls.get_id()[0]
         condition = Condition(name, "=", id)
         return await cls.find_one(
@@ -264,84 +930,329 @@ class Model(metaclass=ModelMeta):
             result.append(entity)
         return result
 
-    def __get_insert_sql(self):
-        fields_name = []
-        placeholders = []
-        fields_values = {}
-
-        for name, field in self._instance.items():
-            value = self[name]
-            if isinstance(field, Model):
-                name_id_fk = field.get_id()[0]
-                value = self[name][name_id_fk]
+    def __get_insert_values(self) -> Dict[str, Any]:
+        return {name: Model.__related_key(field) for name, field in self._instance.items()}
 
-            fields_values[name] = value
-            fields_name.append(name)
-            placeholders.append(":{field}".format(field=name))
+    def __get_insert_sql(self, returning: str | None = None):
+        fields_values = self.__get_insert_values()
+        fields_name = list(fields_values.keys())
+        placeholders = [":{field}".format(field=name) for name in fields_name]
 
         query_executor = get_dialect(str(self.__db__.url.dialect))
-        sql = query_executor.insert_sql(self.get_name(), fields_name, placeholders)
+        sql = query_executor.insert_sql(self.get_name(), fields_name, placeholders, returning)
         return sql, fields_values
 
-    @classmethod
-    def __get_sql_last_inserted_id(cls):
-        name, _ = cls.get_id()
-        query_executor = get_dialect(str(cls.__db__.url.dialect))
-        return query_executor.select_last_id(name, cls.get_name())
+    @staticmethod
+    def __persisted(entity: "Model") -> None:
+        entity._changed.clear()
+        entity._persisted = True
+        session = Session.current()
+        if session is not None:
+            session.register(entity)
 
-    async def __get_last_insert_id(self):
-        sql = self.__get_sql_last_inserted_id()
-        return await self.__db__.fetch_one(sql)
+    @staticmethod
+    def __discard(model: Type["Model"]) -> None:
+        session = Session.current()
+        if session is not None:
+            session.discard(model)
 
     @classmethod
     async def save(cls, model: T):
-        sql, values = model.__get_insert_sql()
-        await cls.__db__.execute(query=sql, values=values)
-        data = await model.__get_last_insert_id()
+        from duck_orm.sql.relationship import OneToOne
+
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
         name, field = cls.get_id()
-        if data is not None:
-            data = data._mapping
-            from duck_orm.sql.relationship import OneToOne
-
-            if isinstance(field, OneToOne):
-                field_model = model._instance[name]
-                if isinstance(field_model, Model):
-                    name_id_model = field_model.get_id()[0]
-                    field_model.__setattr__(name_id_model, data[name])
-                    model._instance[name] = field_model
-            else:
-                model._instance[name] = data[name]
+        assign_id = name not in model._instance and not isinstance(field, OneToOne)
+        if assign_id and query_executor.supports_returning:
+            sql, values = model.__get_insert_sql(returning=name)
+            data = await cls.__db__.fetch_one(query=sql, values=values)
+            cls.invalidate_cache()
+            if data is not None:
+                model._instance[name] = data._mapping[name]
+            Model.__persisted(model)
+            return model
+
+        sql, values = model.__get_insert_sql()
+        last_id = await cls.__db__.execute(query=sql, values=values)
+        cls.invalidate_cache()
+        sequential_id = isinstance(field, (fields_type.Integer, fields_type.BigInteger))
+        if assign_id and sequential_id and last_id is not None:
+            model._instance[name] = last_id
+        Model.__persisted(model)
         return model
 
-    def __update_sql(self, fields: List[str]):
+    @classmethod
+    def __get_insert_many_sql(cls, fields_name: Tuple[str, ...], models: List[T], returning: str | None):
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        sql = query_executor.insert_many_sql(cls.get_name(), list(fields_name), len(models), returning)
+        values: Dict[str, Any] = {}
+        for row, model in enumerate(models):
+            for name, value in model.__get_insert_values().items():
+                values[query_executor.insert_many_placeholder(name, row)] = value
+        return sql, values
+
+    @classmethod
+    async def save_many(cls, models: List[T], batch_size: int = SAVE_MANY_BATCH_SIZE) -> List[T]:
+        from duck_orm.sql.relationship import OneToOne
+
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        name_id, field_id = cls.get_id()
+        sequential_id = isinstance(field_id, (fields_type.Integer, fields_type.BigInteger))
+        groups: Dict[Tuple[str, ...], List[T]] = {}
+        for model in models:
+            groups.setdefault(tuple(model._instance.keys()), []).append(model)
+
+        async with cls.__db__.transaction():
+            for fields_name, group in groups.items():
+                assign_id = name_id not in fields_name and not isinstance(field_id, OneToOne)
+                returning = name_id if assign_id and query_executor.supports_returning else None
+                size = max(1, min(batch_size, MAX_SQL_PARAMETERS // max(1, len(fields_name))))
+                if returning and not sequential_id:
+                    size = 1
+                for start in range(0, len(group), size):
+                    batch = group[start : start + size]
+                    sql, values = cls.__get_insert_many_sql(fields_name, batch, returning)
+                    if returning:
+                        data = await cls.__db__.fetch_all(query=sql, values=values)
+                        ids = sorted(row._mapping[name_id] for row in data)
+                        for model, id in zip(batch, ids):
+                            model._instance[name_id] = id
+                        continue
+
+                    last_id = await cls.__db__.execute(query=sql, values=values)
+                    if assign_id and sequential_id and last_id is not None:
+                        first_id = last_id - len(batch) + 1
+                        for index, model in enumerate(batch):
+                            model._instance[name_id] = first_id + index
+        cls.invalidate_cache()
+        for model in models:
+            Model.__persisted(model)
+        return models
+
+    @classmethod
+    async def upsert(
+        cls,
+        models: T | List[T],
+        conflict_columns: List[str],
+        update_columns: List[str] | None = None,
+        batch_size: int = SAVE_MANY_BATCH_SIZE,
+    ) -> T | List[T]:
+        if not conflict_columns:
+            raise Exception("upsert requires at least one conflict column")
+
+        many = isinstance(models, list)
+        entities: List[T] = models if isinstance(models, list) else [models]
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        name_id = cls.get_id()[0]
+        groups: Dict[Tuple[str, ...], List[T]] = {}
+        for model in entities:
+            fields_name = tuple(model._instance.keys())
+            if any(column not in fields_name for column in conflict_columns):
+                raise Exception("The conflict columns must be filled in all the objects")
+            groups.setdefault(fields_name, []).append(model)
+
+        async with cls.__db__.transaction():
+            for fields_name, group in groups.items():
+                columns = update_columns
+                if columns is None:
+                    columns = [name for name in fields_name if name not in conflict_columns and name != name_id]
+                returning = None
+                if columns and query_executor.supports_returning:
+                    returning = ", ".join(dict.fromkeys([name_id, *conflict_columns]))
+
+                size = max(1, min(batch_size, MAX_SQL_PARAMETERS // max(1, len(fields_name))))
+                for start in range(0, len(group), size):
+                    batch = group[start : start + size]
+                    rows = {
+                        tuple(Model.__related_key(model._instance[column]) for column in conflict_columns): model
+                        for model in batch
+                    }
+                    sql = query_executor.upsert_sql(
+                        cls.get_name(), list(fields_name), len(rows), conflict_columns, columns, returning
+                    )
+                    values: Dict[str, Any] = {}
+                    for row, model in enumerate(rows.values()):
+                        for name, value in model.__get_insert_values().items():
+                            values[query_executor.insert_many_placeholder(name, row)] = value
+                    if not returning:
+                        await cls.__db__.execute(query=sql, values=values)
+                        continue
+
+                    ids: Dict[Tuple, Any] = {}
+                    for data in await cls.__db__.fetch_all(query=sql, values=values):
+                        key = tuple(data._mapping[column] for column in conflict_columns)
+                        ids[key] = data._mapping[name_id]
+                    for model in batch:
+                        key = tuple(Model.__related_key(model._instance[column]) for column in conflict_columns)
+                        if key in ids:
+                            model._instance[name_id] = ids[key]
+        cls.invalidate_cache()
+        Model.__discard(cls)
+        for model in entities:
+            model._changed.clear()
+            model._persisted = True
+        return entities if many else entities[0]
+
+    @classmethod
+    def __get_copy_columns(cls) -> List[str]:
+        cls.__load_relationships()
+        name_id, field_id = cls.get_id()
+        fields = cls.get_schema().fields
+        if field_id.auto_increment:
+            return [field for field in fields if field != name_id]
+        return list(fields)
+
+    @staticmethod
+    def __get_copy_row(record: Any, columns: List[str]) -> Tuple:
+        if isinstance(record, Model):
+            record = record._instance
+        if isinstance(record, Mapping):
+            return tuple(Model.__related_key(record.get(column)) for column in columns)
+        return tuple(Model.__related_key(value) for value in record)
+
+    @classmethod
+    async def copy_from(
+        cls,
+        records: Iterable[Any],
+        columns: List[str] | None = None,
+        batch_size: int = COPY_BATCH_SIZE,
+    ) -> int:
+        columns = columns or cls.__get_copy_columns()
+        rows = (Model.__get_copy_row(record, columns) for record in records)
+        dialect = str(cls.__db__.url.dialect)
+
+        async with cls.__db__.connection() as connection:
+            raw_connection = connection.raw_connection
+            if dialect == "postgresql":
+                status = await raw_connection.copy_records_to_table(cls.get_name(), records=rows, columns=columns)
+                cls.invalidate_cache()
+                return int(status.split()[-1])
+
+            count = 0
+            sql = get_dialect(dialect).bulk_insert_sql(cls.get_name(), columns)
+            async with connection.transaction():
+                while True:
+                    batch = list(islice(rows, batch_size))
+                    if not batch:
+                        break
+                    await raw_connection.executemany(sql, batch)
+                    count += len(batch)
+            cls.invalidate_cache()
+            return count
+
+    def __update_sql(self, fields: List[str], returning: List[str] | None = None):
         field_name_id = self.get_id()[0]
-        field_id = self[field_name_id]
+        field_id = Model.__related_key(self[field_name_id])
 
         if field_id is None:
             raise UpdateException(f"Updating by ID requires that the object {self} has an ID field")
 
-        condition = [f"{field_name_id} = {field_id}"]
+        condition, values = compile_conditions([Condition(field_name_id, "=", field_id)])
         query_executor = get_dialect(str(self.__db__.url.dialect))
-        sql = query_executor.update_sql(self.get_name(), fields, conditions=condition)
+        sql = query_executor.update_sql(self.get_name(), fields, conditions=[condition], returning=returning)
+
+        return sql, values, field_name_id, field_id
+
+    @staticmethod
+    def __get_set_sql(kwargs: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+        return compile_set(
+            {
+                name: value if isinstance(value, Expression) else Model.__related_key(value)
+                for name, value in kwargs.items()
+            }
+        )
+
+    async def update(self, refresh: bool = True, **kwargs):
+        fields, values = Model.__get_set_sql(kwargs)
+        expressions = [name for name, value in kwargs.items() if isinstance(value, Expression)]
+
+        query_executor = get_dialect(str(self.__db__.url.dialect))
+        returning = None
+        if query_executor.supports_returning:
+            returning = self.__get_fields_all() if refresh else expressions or None
+        sql, values_condition, field_name_id, field_id = self.__update_sql(fields, returning)
+        values.update(values_condition)
+        if not refresh:
+            returned: Dict[str, Any] = {}
+            if returning:
+                data = await self.__db__.fetch_one(query=sql, values=values)
+                returned = dict(data._mapping) if data is not None else {}
+            else:
+                await self.__db__.execute(query=sql, values=values)
+                if expressions:
+                    condition_with_id = Condition(field_name_id, "=", field_id)
+                    rows = await type(self).values(expressions, conditions=[condition_with_id])
+                    returned = rows[0] if rows else {}
+            self.invalidate_cache()
+            self._instance.update({name: value for name, value in kwargs.items() if name not in expressions})
+            self._instance.update(returned)
+            self._changed.difference_update(kwargs)
+            return self
+
+        session = Session.current()
+        mapped = session.get(type(self), field_id) if session is not None else None
+        if mapped is not None:
+            session.discard(type(self), field_id)
+
+        if returning:
+            data = await self.__db__.fetch_one(query=sql, values=values)
+            self.invalidate_cache()
+            entities = await self.__build_entities([data._mapping]) if data is not None else []
+            entity = entities[0] if entities else None
+        else:
+            await self.__db__.execute(query=sql, values=values)
+            self.invalidate_cache()
+            condition_with_id = Condition(field_name_id, "=", field_id)
+            entity = await self.find_one(conditions=[condition_with_id])
 
-        return sql, field_name_id, field_id
+        self._changed.difference_update(kwargs)
+        if mapped is not None and entity is not None:
+            entity = session.refresh(mapped, entity)
+        return entity
 
-    async def update(self, **kwargs):
-        fields = []
-        values = {}
-        for name, value in kwargs.items():
-            if isinstance(value, Model):
-                name_id_fk = value.get_id()[0]
-                value = value[name_id_fk]
+    async def flush(self, refresh: bool = False):
+        if self.get_key() is None:
+            return await type(self).save(self)
 
-            fields_tmp = "{field} = :{field}".format(field=name)
-            fields.append(fields_tmp)
-            values[name] = value
+        fields = self.get_changed_fields()
+        if not fields:
+            return self
+        return await self.update(refresh=refresh, **{name: self._instance[name] for name in fields})
 
-        sql, field_name_id, field_id = self.__update_sql(fields)
-        await self.__db__.execute(query=sql, values=values)
-        condition_with_id = Condition(field_name_id, "=", field_id)
-        return await self.find_one(conditions=[condition_with_id])
+    @classmethod
+    async def update_many(
+        cls, models: List[T], fields: List[str] | None = None, batch_size: int = SAVE_MANY_BATCH_SIZE
+    ) -> List[T]:
+        name_id = cls.get_id()[0]
+        columns = cls.get_schema().fields
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        groups: Dict[Tuple[str, ...], List[T]] = {}
+        for model in models:
+            if model._instance.get(name_id) is None:
+                raise UpdateException(f"Updating by ID requires that the object {model} has an ID field")
+            names = fields if fields is not None else model.get_changed_fields()
+            names = [name for name in names if name != name_id and name in columns]
+            groups.setdefault(tuple(names), []).append(model)
+
+        async with cls.__db__.transaction():
+            for names, group in groups.items():
+                if not names:
+                    continue
+                sql = query_executor.update_sql(
+                    cls.get_name(),
+                    ["{field} = :{field}".format(field=name) for name in names],
+                    conditions=["{field} = :{field}".format(field=name_id)],
+                )
+                for start in range(0, len(group), batch_size):
+                    values = [
+                        {name: Model.__related_key(model._instance.get(name)) for name in (*names, name_id)}
+                        for model in group[start : start + batch_size]
+                    ]
+                    await cls.__db__.execute_many(query=sql, values=values)
+        cls.invalidate_cache()
+        for model in models:
+            model._changed.clear()
+        return models
 
     @classmethod
     def __drop_table(cls, dialect: str, name_table: str, cascade: bool = False):
@@ -352,18 +1263,57 @@ class Model(metaclass=ModelMeta):
     async def drop_table(cls, cascade: bool = False):
         sql = cls.__drop_table(str(cls.__db__.url.dialect), cls.get_name(), cascade)
         await cls.__db__.execute(sql)
+        cls.invalidate_cache()
+        Model.__discard(cls)
+
+    @classmethod
+    async def __execute_changes(cls, sql: str, values: Dict[str, Any]) -> int:
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        statement, changes_sql = query_executor.count_changes_sql(sql)
+        async with cls.__db__.connection() as connection:
+            if changes_sql is None:
+                return int(await connection.fetch_val(query=statement, values=values))
+            await connection.execute(query=statement, values=values)
+            return int(await connection.fetch_val(query=changes_sql))
 
     @classmethod
-    def __delete(cls, name_table: str, conditions: List[Condition], dialect: str) -> str:
+    async def update_where(cls, conditions: List[Condition], **kwargs) -> int:
+        if not kwargs:
+            raise UpdateException("update_where requires at least one field to update")
+
+        fields, values = Model.__get_set_sql(kwargs)
+        conditions_str, values_condition = cls.__get_where_sql(conditions)
+        values.update(values_condition)
+
+        query_executor = get_dialect(str(cls.__db__.url.dialect))
+        sql = query_executor.update_sql(cls.get_name(), fields, conditions=[conditions_str])
+        count = await cls.__execute_changes(sql, values)
+        cls.invalidate_cache()
+        Model.__discard(cls)
+        return count
+
+    @classmethod
+    def __delete(
+        cls, conditions: List[Condition], dialect: str, chunk_size: int | None = None
+    ) -> tuple[str, Dict[str, Any]]:
         query_executor = get_dialect(dialect)
-        conditions_str = " and ".join(map(lambda condition: condition.get_condition(), conditions))
-        return query_executor.delete_sql(name_table, conditions_str)
+        conditions_str, values = cls.__get_where_sql(conditions)
+        if chunk_size:
+            name_id = cls.get_id()[0]
+            return query_executor.delete_chunk_sql(cls.get_name(), name_id, conditions_str, chunk_size), values
+        return query_executor.delete_sql(cls.get_name(), conditions_str), values
 
     @classmethod
-    async def delete(cls, conditions: List[Condition]):
+    async def delete(cls, conditions: List[Condition], chunk_size: int | None = None) -> int:
+        sql, values = cls.__delete(conditions, str(cls.__db__.url.dialect), chunk_size)
+        count = 0
         try:
-            dialect = cls.__db__.url.dialect
-            sql = cls.__delete(cls.get_name(), conditions, str(dialect))
-            await cls.__db__.execute(sql)
-        except Exception as ex:
-            Exception("DELETE ERROR: {ex}".format(ex=ex))
+            while True:
+                changes = await cls.__execute_changes(sql, values)
+                count += changes
+                if not chunk_size or changes < chunk_size:
+                    break
+        finally:
+            cls.invalidate_cache()
+            Model.__discard(cls)
+        return count
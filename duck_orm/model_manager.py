@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List
 
 from databases.core import Database
 
@@ -47,6 +47,10 @@ class ModelManager:
             logging.warning("No models found")
             Exception("No models found: I created your models and put the " + "model_manager attribute on them.")
 
+    async def bulk_load(self, model: Model, records: Iterable[Any], columns: List[str] | None = None) -> int:
+        logging.info(f"Bulk load into table {model.get_name()}!")
+        return await model.copy_from(records, columns=columns)
+
     async def drop_all_tables(self):
         logging.debug("Delete all tables in the database.")
         for _, model in self.models.items():
@@ -0,0 +1,96 @@
+import inspect
+from types import MappingProxyType
+from typing import List, Tuple
+
+from duck_orm.sql import fields as fields_type
+
+
+class ModelSchema:
+    __slots__ = (
+        "columns",
+        "columns_map",
+        "fields",
+        "primary_key",
+        "foreign_keys",
+        "relations",
+        "timestamps",
+        "parser_fields",
+        "_create_fields",
+    )
+
+    def __init__(self, model) -> None:
+        from duck_orm.sql.relationship import ForeignKey, ManyToMany, ManyToOne, OneToMany, OneToOne
+
+        columns: List[Tuple[str, fields_type.Column]] = []
+        fields: List[str] = []
+        primary_key = None
+        foreign_keys: List[Tuple[str, fields_type.Column]] = []
+        relations: List[Tuple[str, fields_type.Column]] = []
+        timestamps: List[str] = []
+        parser_fields: List[Tuple[str, fields_type.Column] | str] = []
+
+        for name, field in inspect.getmembers(model):
+            if not isinstance(field, fields_type.Column):
+                continue
+
+            columns.append((name, field))
+            if primary_key is None and field.primary_key:
+                primary_key = (name, field)
+
+            if isinstance(field, fields_type.Timestamp):
+                timestamps.append(name)
+                parser_fields.append((name, field))
+            else:
+                parser_fields.append(name)
+
+            if isinstance(field, (OneToMany, ManyToMany)):
+                relations.append((name, field))
+            else:
+                fields.append(name)
+
+            if isinstance(field, (ManyToOne, OneToOne, ForeignKey)):
+                foreign_keys.append((name, field))
+
+        set_attr = object.__setattr__
+        set_attr(self, "columns", tuple(columns))
+        set_attr(self, "columns_map", MappingProxyType(dict(columns)))
+        set_attr(self, "fields", tuple(fields))
+        set_attr(self, "primary_key", primary_key)
+        set_attr(self, "foreign_keys", tuple(foreign_keys))
+        set_attr(self, "relations", tuple(relations))
+        set_attr(self, "timestamps", tuple(timestamps))
+        set_attr(self, "parser_fields", tuple(parser_fields))
+        set_attr(self, "_create_fields", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ModelSchema is immutable")
+
+    def create_fields(self, dialect: str) -> Tuple[str, ...]:
+        if dialect in self._create_fields:
+            return self._create_fields[dialect]
+
+        from duck_orm.sql.relationship import OneToOne
+
+        fields: List[Tuple[str, str]] = []
+        for name, field in self.columns:
+            if isinstance(field, OneToOne):
+                if not field.model:
+                    raise Exception("Model not found")
+
+                field_id = field.model.get_id()[1]
+                table_name = field.model.get_name()
+                fields.extend(
+                    (
+                        (name, field_id.column_sql(dialect)),
+                        ("", field.create_sql(dialect, name, table_name)),
+                    )
+                )
+            else:
+                fields.insert(0, (name, field.column_sql(dialect)))
+
+        fields_config = tuple(" ".join(field) for field in fields)
+        self._create_fields[dialect] = fields_config
+        return fields_config
+
+    def get_field(self, name: str) -> fields_type.Column | None:
+        return self.columns_map.get(name)
@@ -0,0 +1,108 @@
+from contextlib import AsyncExitStack
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple, Type
+
+if TYPE_CHECKING:
+    from duck_orm.model import Model
+
+FLUSH_BATCH_SIZE = 500
+
+_current_session: ContextVar["Session | None"] = ContextVar("duck_orm_session", default=None)
+
+
+class Session:
+    def __init__(self, batch_size: int = FLUSH_BATCH_SIZE) -> None:
+        self.batch_size = batch_size
+        self.identity_map: Dict[Tuple[Type["Model"], Any], "Model"] = {}
+        self._new: List["Model"] = []
+        self._dirty: Dict[int, "Model"] = {}
+        self._token: Token | None = None
+
+    @staticmethod
+    def current() -> "Session | None":
+        return _current_session.get()
+
+    async def __aenter__(self) -> "Session":
+        if self._token is not None:
+            raise Exception("The session is already open")
+        self._token = _current_session.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        try:
+            if exc_type is None:
+                await self.commit()
+        finally:
+            if self._token is not None:
+                _current_session.reset(self._token)
+                self._token = None
+            self.clear()
+
+    @staticmethod
+    def __identity(entity: "Model") -> Tuple[Type["Model"], Any] | None:
+        key = entity.get_key()
+        if key is None:
+            return None
+        return (type(entity), key)
+
+    def get(self, model: Type["Model"], key: Any) -> "Model | None":
+        return self.identity_map.get((model, key))
+
+    def register(self, entity: "Model") -> "Model":
+        identity = Session.__identity(entity)
+        if identity is None:
+            return entity
+        return self.identity_map.setdefault(identity, entity)
+
+    def discard(self, model: Type["Model"], key: Any = None) -> None:
+        if key is not None:
+            self.identity_map.pop((model, key), None)
+            return
+        for identity in [identity for identity in self.identity_map if identity[0] is model]:
+            del self.identity_map[identity]
+
+    def refresh(self, entity: "Model", source: "Model") -> "Model":
+        entity._instance.update(source._instance)
+        identity = Session.__identity(entity)
+        if identity is not None:
+            self.identity_map[identity] = entity
+        return entity
+
+    def add(self, entity: "Model") -> None:
+        identity = Session.__identity(entity)
+        if not entity._persisted or identity is None:
+            if all(entity is not model for model in self._new):
+                self._new.append(entity)
+            return
+        self.identity_map[identity] = entity
+        self._dirty[id(entity)] = entity
+
+    async def commit(self) -> None:
+        for entity in self.identity_map.values():
+            if entity.get_changed_fields():
+                self._dirty[id(entity)] = entity
+        new, self._new = self._new, []
+        dirty, self._dirty = list(self._dirty.values()), {}
+        if not new and not dirty:
+            return
+
+        new_groups: Dict[Type["Model"], List["Model"]] = {}
+        for entity in new:
+            new_groups.setdefault(type(entity), []).append(entity)
+        dirty_groups: Dict[Type["Model"], List["Model"]] = {}
+        for entity in dirty:
+            dirty_groups.setdefault(type(entity), []).append(entity)
+
+        databases = {id(entity.__db__): entity.__db__ for entity in new + dirty}
+        async with AsyncExitStack() as stack:
+            for database in databases.values():
+                await stack.enter_async_context(database.transaction())
+            for model, entities in new_groups.items():
+                await model.save_many(entities, batch_size=self.batch_size)
+            for model, entities in dirty_groups.items():
+                await model.update_many(entities, batch_size=self.batch_size)
+
+    def clear(self) -> None:
+        self.identity_map.clear()
+        self._new.clear()
+        self._dirty.clear()
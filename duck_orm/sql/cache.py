@@ -0,0 +1,122 @@
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Set, Tuple
+
+STATEMENT_CACHE_SIZE = 512
+
+
+class StatementCache:
+    def __init__(self, maxsize: int = STATEMENT_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._statements: OrderedDict[Hashable, str] = OrderedDict()
+
+    def get(self, key: Hashable, build: Callable[[], str]) -> str:
+        sql = self._statements.get(key)
+        if sql is not None:
+            self.hits += 1
+            self._statements.move_to_end(key)
+            return sql
+
+        self.misses += 1
+        sql = build()
+        self._statements[key] = sql
+        if len(self._statements) > self.maxsize:
+            self._statements.popitem(last=False)
+        return sql
+
+    def clear(self) -> None:
+        self._statements.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._statements),
+            "maxsize": self.maxsize,
+        }
+
+
+statement_cache = StatementCache()
+
+
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_TTL = 60.0
+
+result_caches: "weakref.WeakSet[ResultCache]" = weakref.WeakSet()
+
+
+class ResultCache:
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE, ttl: float | None = RESULT_CACHE_TTL) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._results: OrderedDict[Hashable, Tuple[float | None, Tuple[str, ...], Any]] = OrderedDict()
+        self._tables: Dict[str, Set[Hashable]] = {}
+        result_caches.add(self)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._results.get(key)
+        if entry is not None:
+            expires_at, _, result = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self.hits += 1
+                self._results.move_to_end(key)
+                return True, result
+            self.__remove(key)
+
+        self.misses += 1
+        return False, None
+
+    def set(self, key: Hashable, tables: Tuple[str, ...], result: Any) -> None:
+        if key in self._results:
+            self.__remove(key)
+
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._results[key] = (expires_at, tables, result)
+        for table in tables:
+            self._tables.setdefault(table, set()).add(key)
+
+        if len(self._results) > self.maxsize:
+            self.__remove(next(iter(self._results)))
+            self.evictions += 1
+
+    def invalidate(self, table: str) -> None:
+        for key in self._tables.pop(table, set()):
+            if key in self._results:
+                self.__remove(key)
+
+    def clear(self) -> None:
+        self._results.clear()
+        self._tables.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._results),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+        }
+
+    def __remove(self, key: Hashable) -> None:
+        _, tables, _ = self._results.pop(key)
+        for table in tables:
+            keys = self._tables.get(table)
+            if keys is not None:
+                keys.discard(key)
+
+
+def invalidate_table(table: str) -> None:
+    for cache in list(result_caches):
+        cache.invalidate(table)
@@ -1,15 +1,23 @@
-from typing import List, Union
+from typing import Any, Dict, List, Tuple, Union
 
 from duck_orm.exceptions import OperatorException
-from duck_orm.sql.operator import Operator
+from duck_orm.sql.operator import LIST_OPERATORS, NULL_OPERATORS, Operator
+
+PARAM_NAME = "param_{index}"
+BETWEEN_SQL = "{start} AND {end}"
+NOT_SQL = "NOT {condition}"
+AND = "AND"
+OR = "OR"
 
 
 class Condition:
+    size = 1
+
     def __init__(
         self,
         field: str,
         operator: str,
-        value: Union[List, str, int],
+        value: Union[List, Tuple, str, int, Any] = None,
         lower_str: bool = False,
     ):
         self._field = field
@@ -17,21 +25,114 @@ class Condition:
         self._value = value
         self._lower_str = lower_str
 
-    def get_condition(self):
-        value = ""
-        if isinstance(self._value, str):
-            value = "'{value}'".format(value=self._value)
-        elif isinstance(self._value, int):
-            value = self._value
-        elif isinstance(self._value, List):
-            if self._operator.operator != "IN":
-                raise OperatorException("If the type of the value is List, then the operator must be IN")
-            value = "(" + ", ".join(list(map(lambda x: f"'{x}'", self._value))) + ")"
-        else:
-            raise OperatorException("Value type is not supported")
+    def __and__(self, other: "Condition | Q") -> "Q":
+        return Q(self, other)
+
+    def __or__(self, other: "Condition | Q") -> "Q":
+        return Q(self, other, connector=OR)
+
+    def __invert__(self) -> "Q":
+        return Q(self, negated=True)
 
+    def compile(self, index: int = 0, query_executor: Any = None) -> Tuple[str, Dict[str, Any]]:
+        operator = self._operator.operator
         field = self._field
         if self._lower_str:
             field = "LOWER({field})".format(field=field)
-            value = "LOWER('{value}')".format(value=self._value)
-        return "{field} {operator} {value}".format(field=field, operator=self._operator.operator, value=value)
+
+        if operator in NULL_OPERATORS:
+            return "{field} {operator}".format(field=field, operator=operator), {}
+
+        if isinstance(self._value, (List, Tuple)):
+            if operator not in LIST_OPERATORS:
+                raise OperatorException("If the type of the value is List, then the operator must be IN")
+            if operator == "BETWEEN" and len(self._value) != 2:
+                raise OperatorException("The value of BETWEEN must have two items")
+        elif operator in LIST_OPERATORS:
+            raise OperatorException(f"The value of the operator {operator} must be a List")
+        elif self._value is None or isinstance(self._value, dict):
+            raise OperatorException("Value type is not supported")
+
+        param = PARAM_NAME.format(index=index)
+        if query_executor is not None and operator in ("IN", "NOT IN") and not self._lower_str:
+            list_param = query_executor.list_param_sql(field, operator, param, self._value)
+            if list_param is not None:
+                sql, value = list_param
+                return sql, {param: value}
+
+        values: Dict[str, Any] = {}
+        if isinstance(self._value, (List, Tuple)):
+            params = ["{param}_{index}".format(param=param, index=i) for i in range(len(self._value))]
+            values = dict(zip(params, self._value))
+            if operator == "BETWEEN":
+                placeholder = BETWEEN_SQL.format(start=":" + params[0], end=":" + params[1])
+            else:
+                placeholder = "(" + ", ".join(":" + name for name in params) + ")"
+        else:
+            values[param] = self._value
+            placeholder = ":" + param
+
+        if self._lower_str:
+            placeholder = "LOWER({placeholder})".format(placeholder=placeholder)
+        return "{field} {operator} {placeholder}".format(
+            field=field, operator=operator, placeholder=placeholder
+        ), values
+
+
+class Q:
+    def __init__(self, *conditions: "Condition | Q", connector: str = AND, negated: bool = False):
+        if connector not in (AND, OR):
+            raise OperatorException(f"Connector: {connector} is invalid.")
+        self.children = list(conditions)
+        self.connector = connector
+        self.negated = negated
+
+    @property
+    def size(self) -> int:
+        return sum(child.size for child in self.children)
+
+    def __and__(self, other: "Condition | Q") -> "Q":
+        return Q(self, other)
+
+    def __or__(self, other: "Condition | Q") -> "Q":
+        return Q(self, other, connector=OR)
+
+    def __invert__(self) -> "Q":
+        return Q(*self.children, connector=self.connector, negated=not self.negated)
+
+    def compile(self, index: int = 0, query_executor: Any = None) -> Tuple[str, Dict[str, Any]]:
+        sqls: List[str] = []
+        values: Dict[str, Any] = {}
+        for child in self.children:
+            sql, values_child = child.compile(index, query_executor)
+            index += child.size
+            if sql:
+                sqls.append(sql)
+            values.update(values_child)
+
+        if not sqls:
+            return "", values
+        sql = " {connector} ".format(connector=self.connector).join(sqls)
+        if len(sqls) > 1 or self.negated:
+            sql = "(" + sql + ")"
+        if self.negated:
+            sql = NOT_SQL.format(condition=sql)
+        return sql, values
+
+
+def compile_conditions(
+    conditions: List[Condition | Q] | Condition | Q, query_executor: Any = None
+) -> Tuple[str, Dict[str, Any]]:
+    if isinstance(conditions, (Condition, Q)):
+        conditions = [conditions]
+
+    sqls: List[str] = []
+    values: Dict[str, Any] = {}
+    index = 0
+    for condition in conditions:
+        sql, values_condition = condition.compile(index, query_executor)
+        index += condition.size
+        if sql:
+            sqls.append(sql)
+        values.update(values_condition)
+    return " and ".join(sqls), values
@@ -0,0 +1,81 @@
+from typing import Any, Dict, List, Tuple
+
+PARAM_NAME = "expr_{index}"
+EXPRESSION_SQL = "{left} {operator} {right}"
+SET_FIELD_SQL = "{field} = {value}"
+
+
+class Expression:
+    def __init__(self, left: Any, operator: str, right: Any) -> None:
+        self.left = left
+        self.operator = operator
+        self.right = right
+
+    def __add__(self, other: Any) -> "Expression":
+        return Expression(self, "+", other)
+
+    def __radd__(self, other: Any) -> "Expression":
+        return Expression(other, "+", self)
+
+    def __sub__(self, other: Any) -> "Expression":
+        return Expression(self, "-", other)
+
+    def __rsub__(self, other: Any) -> "Expression":
+        return Expression(other, "-", self)
+
+    def __mul__(self, other: Any) -> "Expression":
+        return Expression(self, "*", other)
+
+    def __rmul__(self, other: Any) -> "Expression":
+        return Expression(other, "*", self)
+
+    def __truediv__(self, other: Any) -> "Expression":
+        return Expression(self, "/", other)
+
+    def __rtruediv__(self, other: Any) -> "Expression":
+        return Expression(other, "/", self)
+
+    def compile(self, values: Dict[str, Any]) -> str:
+        return EXPRESSION_SQL.format(
+            left=compile_operand(self.left, values),
+            operator=self.operator,
+            right=compile_operand(self.right, values),
+        )
+
+
+class F(Expression):
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def compile(self, values: Dict[str, Any]) -> str:
+        return self.name
+
+
+class Count:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+def compile_operand(value: Any, values: Dict[str, Any]) -> str:
+    if isinstance(value, F):
+        return value.compile(values)
+    if isinstance(value, Expression):
+        return "(" + value.compile(values) + ")"
+
+    name = PARAM_NAME.format(index=len(values))
+    values[name] = value
+    return ":" + name
+
+
+def compile_set(fields: Dict[str, Any]) -> Tuple[List[str], Dict[str, Any]]:
+    fields_values: List[str] = []
+    values: Dict[str, Any] = {}
+    expression_values: Dict[str, Any] = {}
+    for name, value in fields.items():
+        if isinstance(value, Expression):
+            fields_values.append(SET_FIELD_SQL.format(field=name, value=value.compile(expression_values)))
+        else:
+            fields_values.append(SET_FIELD_SQL.format(field=name, value=":" + name))
+            values[name] = value
+    values.update(expression_values)
+    return fields_values, values
@@ -18,6 +18,12 @@ class ActionsEnum(Enum):
         return value in cls._value2member_map_
 
 
+class LoadingEnum(Enum):
+    EAGER = "eager"
+    LAZY = "lazy"
+    NONE = "none"
+
+
 class Column:
     def __init__(
         self,
@@ -112,6 +118,12 @@ class BigInteger(Column, int):
     def __init__(self, unique: bool = False, primary_key: bool = False, default_value=None):
         super().__init__("bigint", unique, primary_key, default_value=default_value)
 
+    def column_sql(self, dialect: str):
+        column_sql = super().column_sql(dialect)
+        if self.primary_key and dialect == "sqlite":
+            column_sql = column_sql.replace(self.type_sql(dialect), self.get_dialect(dialect)["int"], 1)
+        return column_sql
+
 
 class Varchar(Column, str):
     def __new__(cls, **kwargs):
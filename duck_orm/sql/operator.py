@@ -1,21 +1,15 @@
 from duck_orm.exceptions import OperatorException
 
+OPERATORS = ("=", "!=", "<>", "<", ">", "<=", ">=", "LIKE", "NOT LIKE", "IN", "NOT IN", "BETWEEN")
+NULL_OPERATORS = ("IS NULL", "IS NOT NULL")
+LIST_OPERATORS = ("IN", "NOT IN", "BETWEEN")
+
 
 class Operator:
     operator: str
 
     def __init__(self, operator: str):
-        if operator == "=":
-            self.operator = "="
-        elif operator == "<=":
-            self.operator = "<="
-        elif operator == ">=":
-            self.operator = ">="
-        elif operator == "LIKE":
-            self.operator = "LIKE"
-        elif operator == "NOT IN":
-            self.operator = "NOT IN"
-        elif operator == "IN":
-            self.operator = "IN"
-        else:
+        name = operator.upper()
+        if name not in OPERATORS and name not in NULL_OPERATORS:
             raise OperatorException(f"Operator: {operator} is invalid.")
+        self.operator = name
@@ -1,6 +1,10 @@
+from typing import Any, List, Tuple
+
 from duck_orm.sql.sql import QueryExecutor
 
 SELECT_TABLES_SQL = "SELECT tablename " + "FROM pg_tables " + "WHERE schemaname = 'public';"
+ANY_SQL = "{field} = ANY(:{param})"
+ALL_SQL = "{field} <> ALL(:{param})"
 TYPES_SQL = {
     "str": "TEXT",
     "int": "INTEGER",
@@ -14,6 +18,13 @@ TYPES_SQL = {
 
 
 class QueryPostgres(QueryExecutor):
+    supports_returning = True
+
+    @classmethod
+    def list_param_sql(cls, field: str, operator: str, param: str, value: List[Any]) -> Tuple[str, Any] | None:
+        sql = ANY_SQL if operator == "IN" else ALL_SQL
+        return sql.format(field=field, param=param), list(value)
+
     @classmethod
     def select_tables_sql(cls):
         return SELECT_TABLES_SQL
@@ -1,12 +1,42 @@
 import inspect
-from typing import Any, Dict, List, Type, Union
+from typing import Any, Dict, List, Type
 
+from duck_orm.exceptions import LazyLoadException
 from duck_orm.model import Model
 from duck_orm.sql.condition import Condition
-from duck_orm.sql.fields import ActionsEnum, Column
+from duck_orm.sql.fields import ActionsEnum, Column, LoadingEnum
 from duck_orm.utils.functions import get_dialect
 
 
+class LazyModel:
+    __slots__ = ("model", "key", "_entity", "_loaded")
+
+    def __init__(self, model: Type[Model], key: Any) -> None:
+        self.model = model
+        self.key = key
+        self._entity: Model | None = None
+        self._loaded = False
+
+    async def load(self) -> Model | None:
+        if not self._loaded:
+            self._entity = await self.model.find_by_id(self.key)
+            self._loaded = True
+        return self._entity
+
+    def __await__(self):
+        return self.load().__await__()
+
+    def __getattr__(self, key: str):
+        if self._loaded:
+            return getattr(self._entity, key)
+        if key == self.model.get_id()[0]:
+            return self.key
+        raise LazyLoadException(f"The {self.model.get_name()} model must be awaited before reading '{key}'")
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+
 class ForeignKey(Column):
     def __new__(cls, **kwargs):
         return super().__new__(cls)
@@ -19,10 +49,12 @@ class ForeignKey(Column):
         name_constraint: str = "",
         on_delete: ActionsEnum = ActionsEnum.NO_ACTION,
         on_update: ActionsEnum = ActionsEnum.CASCADE,
+        loading: LoadingEnum = LoadingEnum.EAGER,
     ) -> None:
         self.validate_action(on_delete.value, on_update.value)
         self.model = model
         self.name_in_table_fk = name_in_table_fk
+        self.loading = LoadingEnum(loading)
         self.unique = unique
         self.on_delete = on_delete.value
         self.on_update = on_update.value
@@ -51,29 +83,50 @@ class OneToMany(Column):
     def __init__(self, model: Model, name_in_table_fk: str) -> None:
         self.model = model
         self.name_in_table_fk = name_in_table_fk
-        self.model_: Union[Model, None] = None
         super().__init__("OneToMany")
 
+    def bind(self, model_: Model | None) -> "OneToManyManager":
+        return OneToManyManager(self, model_)
+
+    async def add(self, model: Model):
+        return await self.bind(None).add(model)
+
+    async def get_all(self) -> List[Model]:
+        return await self.bind(None).get_all()
+
+
+class OneToManyManager:
+    __slots__ = ("field", "model_")
+
+    def __init__(self, field: OneToMany, model_: Model | None) -> None:
+        self.field = field
+        self.model_ = model_
+
+    def __getattr__(self, key: str):
+        return getattr(self.field, key)
+
     async def add(self, model: Model):
         if self.model_:
-            model._instance[self.name_in_table_fk] = self.model_
-        self.model_ = None
-        return await self.model.save(model)
+            model._instance[self.field.name_in_table_fk] = self.model_
+        return await self.field.model.save(model)
 
     async def get_all(self) -> List[Model]:
         if not self.model_:
-            return await self.model.find_all()
+            return await self.field.model.find_all()
+        if self.field in self.model_._prefetched:
+            return list(self.model_._prefetched[self.field])
         field_name = self.model_.get_id()[0]
-        condition = Condition(self.name_in_table_fk, "=", self.model_[field_name])
-        return await self.model.find_all(conditions=[condition])
+        condition = Condition(self.field.name_in_table_fk, "=", self.model_[field_name])
+        return await self.field.model.find_all(conditions=[condition])
 
 
 class ManyToOne(Column):
     def __new__(cls, **kwargs):
         return super().__new__(cls)
 
-    def __init__(self, model: Model):
+    def __init__(self, model: Model, loading: LoadingEnum = LoadingEnum.EAGER):
         self.model = model
+        self.loading = LoadingEnum(loading)
         super().__init__("OneToMany")
 
 
@@ -90,9 +143,11 @@ class OneToOne(Column):
         name_model: str = "",
         name_fk: str = "",
         type_fk: Column | None = None,
+        loading: LoadingEnum = LoadingEnum.EAGER,
     ) -> None:
         self.validate_action(on_delete.value, on_update.value)
         self.model = model
+        self.loading = LoadingEnum(loading)
         self.name_constraint = name_constraint
         self.on_delete = on_delete.value
         self.on_update = on_update.value
@@ -162,13 +217,45 @@ class ManyToMany(Column):
 
     def __init__(self, model: Type[Model], model_relation: Type[Model]):
         self.model = model
-        self.model_: Model | None = None
         self.model_relation = model_relation
         super().__init__("ManyToMany")
 
+    def bind(self, model_: Model | None) -> "ManyToManyManager":
+        return ManyToManyManager(self, model_)
+
     async def add_models(self, model_instance_one: Model, model_instance_two: Model):
+        return await self.bind(None).add_models(model_instance_one, model_instance_two)
+
+    async def add(self, model_instance_one: Model):
+        return await self.bind(None).add(model_instance_one)
+
+    async def get_all(
+        self,
+        limit: int | None = None,
+        order_by: List[str] = [],
+        offset: int | None = None,
+        loading: LoadingEnum | str | None = None,
+    ) -> List[Model]:
+        return await self.bind(None).get_all(limit=limit, order_by=order_by, offset=offset, loading=loading)
+
+    async def count(self) -> int:
+        return await self.bind(None).count()
+
+
+class ManyToManyManager:
+    __slots__ = ("field", "model_")
+
+    def __init__(self, field: ManyToMany, model_: Model | None) -> None:
+        self.field = field
+        self.model_ = model_
+
+    def __getattr__(self, key: str):
+        return getattr(self.field, key)
+
+    async def add_models(self, model_instance_one: Model, model_instance_two: Model):
+        model_relation = self.field.model_relation
         model_dict: Dict[str, Any] = {}
-        for name, field in inspect.getmembers(self.model_relation):
+        for name, field in inspect.getmembers(model_relation):
             if (isinstance(field, ForeignKey)) and not field.primary_key:
                 if model_instance_one.__tablename__ == field.model.__tablename__:
                     name_field = model_instance_one.get_id()[0]
@@ -177,13 +264,13 @@ class ManyToMany(Column):
                     name_field = model_instance_two.get_id()[0]
                     model_dict[name] = model_instance_two[name_field]
 
-        model_save = self.model_relation(**model_dict)
-        self.model_ = None
-        return await self.model_relation.save(model_save)
+        model_save = model_relation(**model_dict)
+        return await model_relation.save(model_save)
 
     async def add(self, model_instance_one: Model):
+        model_relation = self.field.model_relation
         model_dict: Dict[str, Any] = {}
-        for name, field in inspect.getmembers(self.model_relation):
+        for name, field in inspect.getmembers(model_relation):
             if (isinstance(field, ForeignKey)) and not field.primary_key:
                 if model_instance_one.__tablename__ == field.model.__tablename__:
                     name_field = model_instance_one.get_id()[0]
@@ -192,29 +279,22 @@ class ManyToMany(Column):
                     name_field = self.model_.get_id()[0]
                     model_dict[name] = self.model_[name_field]
 
-        model_save = self.model_relation(**model_dict)
-        self.model_ = None
-        return await self.model_relation.save(model_save)
+        model_save = model_relation(**model_dict)
+        return await model_relation.save(model_save)
 
-    async def get_all(self):
-        if self.model_:
-            field_name = self.model_.get_id()[0]
-            value_field = self.model_[field_name]
-            field_name_relation = ""
-
-        field_name_other_model = ""
-        for name, field in inspect.getmembers(self.model_relation):
-            if (isinstance(field, ForeignKey)) and not field.primary_key:
-                if self.model == field.model:
-                    field_name_other_model = name
-                elif isinstance(self.model_, field.model):
-                    field_name_relation = name
-
-        models_relations: List[Model] = []
-        if self.model_:
-            condition = Condition(field_name_relation, "=", value_field)
-            models_relations = await self.model_relation.find_all(conditions=[condition])
-        else:
-            models_relations = await self.model_relation.find_all()
+    async def get_all(
+        self,
+        limit: int | None = None,
+        order_by: List[str] = [],
+        offset: int | None = None,
+        loading: LoadingEnum | str | None = None,
+    ) -> List[Model]:
+        prefetched = self.model_._prefetched.get(self.field) if self.model_ else None
+        if prefetched is not None and limit is None and not order_by and offset is None and loading is None:
+            return list(prefetched)
+        return await self.field.model.find_by_relation(
+            self.field.model_relation, self.model_, limit=limit, order_by=order_by, offset=offset, loading=loading
+        )
 
-        return list(map(lambda model: model[field_name_other_model], models_relations))
+    async def count(self) -> int:
+        return await self.field.model.count_by_relation(self.field.model_relation, self.model_)
@@ -1,15 +1,48 @@
-from typing import List, Mapping
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+
+from duck_orm.sql.cache import statement_cache
 
 SELECT_TABLES_SQL = "SELECT name FROM sqlite_master where type = 'table';"
 SELECT_TABLE_SQL = "SELECT {fields} FROM {table}"
 LIMIT_SQL = " LIMIT {limit}"
-ORDER_BY_SQL = " ORDER BY {name_id} DESC"
+OFFSET_SQL = " OFFSET {offset}"
+ORDER_BY_SQL = " ORDER BY {fields}"
+KEYSET_SQL = "({fields}) {operator} ({placeholders})"
+KEYSET_PLACEHOLDER = "after_{index}"
+COUNT_SQL = "SELECT COUNT(*) AS count FROM {table} WHERE {conditions};"
+EXISTS_SQL = "SELECT EXISTS(SELECT 1 FROM {table} WHERE {conditions}) AS result;"
+AGGREGATE_FIELD_SQL = "{function}({field}) AS {alias}"
+AGGREGATE_ALIAS = "{function}_{field}"
+AGGREGATE_FUNCTIONS = ("sum", "min", "max", "avg")
+GROUP_BY_SQL = " GROUP BY {fields}"
 SELECT_TABLE_WHERE_SQL = SELECT_TABLE_SQL + " WHERE {conditions}"
-SELECT_LAST_ID_ORDER_BY_SQL = "SELECT {name_id} FROM {table} " + ORDER_BY_SQL + " LIMIT 1;"
-INSERT_INTO_SQL = "INSERT INTO {table}({fields_name}) VALUES({placeholders});"
+SELECT_JOIN_SQL = "SELECT {fields} FROM ({select}) AS {table}{joins}"
+LEFT_JOIN_SQL = " LEFT JOIN {table_relation} AS {alias} ON {alias}.{field} = {table}.{name}"
+SELECT_RELATION_SQL = (
+    "SELECT {fields} FROM {table} JOIN {table_relation} ON {table_relation}.{field} = {table}.{name} WHERE {conditions}"
+)
+FIELD_ALIAS_SQL = "{table}.{field} AS {alias}"
+RELATED_ALIAS = "related_{name}"
+RELATED_FIELD_ALIAS = "{name}__{field}"
+RELATION_KEY_ALIAS = "relation__{field}"
+COUNT_RELATION_SQL = "(SELECT COUNT(*) FROM {table_relation} WHERE {table_relation}.{field} = {table}.{name})"
+ANNOTATION_SQL = "{expression} AS {alias}"
+INSERT_INTO_SQL = "INSERT INTO {table}({fields_name}) VALUES({placeholders}){returning};"
+INSERT_MANY_SQL = "INSERT INTO {table}({fields_name}) VALUES {values}{returning};"
+RETURNING_SQL = " RETURNING {name_id}"
+UPSERT_SQL = "INSERT INTO {table}({fields_name}) VALUES {values} ON CONFLICT ({conflict}) {action}{returning};"
+UPSERT_UPDATE_SQL = "DO UPDATE SET {fields}"
+UPSERT_NOTHING_SQL = "DO NOTHING"
+EXCLUDED_FIELD_SQL = "{field} = excluded.{field}"
+INSERT_MANY_PLACEHOLDER = "{field}_{row}"
+BULK_INSERT_SQL = "INSERT INTO {table}({fields_name}) VALUES({placeholders});"
 CREATE_SQL = "CREATE TABLE IF NOT EXISTS {name} ({fields});"
-UPDATE_SQL = "UPDATE {table} SET {fields_values} WHERE {conditions};"
+UPDATE_SQL = "UPDATE {table} SET {fields_values} WHERE {conditions}{returning};"
 DELETE_SQL = "DELETE FROM {table} WHERE {conditions};"
+DELETE_CHUNK_SQL = (
+    "DELETE FROM {table} WHERE {name_id} IN (SELECT {name_id} FROM {table} WHERE {conditions} LIMIT {limit});"
+)
+COUNT_CHANGES_SQL = "WITH changed AS ({statement} RETURNING 1) SELECT COUNT(*) FROM changed;"
 DROP_TABLE_SQL = "DROP TABLE IF EXISTS {name}"
 ADD_COLUMN_SQL = "ALTER TABLE {table_name} ADD COLUMN {field_name} {field_type} "
 ADD_FK_SQL = "REFERENCES {table_relation} ({field}) ON DELETE {on_delete} ON UPDATE {on_update}"
@@ -21,46 +54,411 @@ ADD_COLUMN_FK_SQL = ADD_COLUMN_SQL + ADD_FK_SQL
 
 
 class QueryExecutor:
+    supports_returning = False
+
     @classmethod
     def create_sql(cls, name_table: str, fields: List[str]):
         return CREATE_SQL.format(name=name_table, fields=", ".join(fields))
 
     @classmethod
-    def insert_sql(cls, name_table: str, fields_name: List[str], placeholders: List[str]):
-        return INSERT_INTO_SQL.format(
+    def insert_sql(
+        cls,
+        name_table: str,
+        fields_name: List[str],
+        placeholders: List[str],
+        returning: str | None = None,
+    ):
+        key = (cls, "insert", name_table, tuple(fields_name), tuple(placeholders), returning)
+        return statement_cache.get(
+            key,
+            lambda: INSERT_INTO_SQL.format(
+                table=name_table,
+                fields_name=", ".join(fields_name),
+                placeholders=", ".join(placeholders),
+                returning=RETURNING_SQL.format(name_id=returning) if returning else "",
+            ),
+        )
+
+    @classmethod
+    def insert_many_sql(cls, name_table: str, fields_name: List[str], rows: int, returning: str | None = None):
+        key = (cls, "insert_many", name_table, tuple(fields_name), rows, returning)
+        return statement_cache.get(key, lambda: cls.__insert_many_sql(name_table, fields_name, rows, returning))
+
+    @classmethod
+    def __insert_many_sql(cls, name_table: str, fields_name: List[str], rows: int, returning: str | None) -> str:
+        return INSERT_MANY_SQL.format(
             table=name_table,
             fields_name=", ".join(fields_name),
-            placeholders=", ".join(placeholders),
+            values=cls.__values_sql(fields_name, rows),
+            returning=RETURNING_SQL.format(name_id=returning) if returning else "",
+        )
+
+    @classmethod
+    def __values_sql(cls, fields_name: List[str], rows: int) -> str:
+        values = []
+        for row in range(rows):
+            placeholders = [":" + cls.insert_many_placeholder(field, row) for field in fields_name]
+            values.append("(" + ", ".join(placeholders) + ")")
+        return ", ".join(values)
+
+    @classmethod
+    def upsert_sql(
+        cls,
+        name_table: str,
+        fields_name: List[str],
+        rows: int,
+        conflict_columns: List[str],
+        update_columns: List[str],
+        returning: str | None = None,
+    ):
+        key = (
+            cls,
+            "upsert",
+            name_table,
+            tuple(fields_name),
+            rows,
+            tuple(conflict_columns),
+            tuple(update_columns),
+            returning,
+        )
+        return statement_cache.get(
+            key,
+            lambda: UPSERT_SQL.format(
+                table=name_table,
+                fields_name=", ".join(fields_name),
+                values=cls.__values_sql(fields_name, rows),
+                conflict=", ".join(conflict_columns),
+                action=cls.upsert_action_sql(update_columns),
+                returning=RETURNING_SQL.format(name_id=returning) if returning else "",
+            ),
         )
 
     @classmethod
-    def update_sql(cls, name_table: str, fields_values: List[str], conditions: List[str]):
-        return UPDATE_SQL.format(
+    def upsert_action_sql(cls, update_columns: List[str]) -> str:
+        if not update_columns:
+            return UPSERT_NOTHING_SQL
+        return UPSERT_UPDATE_SQL.format(
+            fields=", ".join(EXCLUDED_FIELD_SQL.format(field=field) for field in update_columns)
+        )
+
+    @classmethod
+    def insert_many_placeholder(cls, field: str, row: int) -> str:
+        return INSERT_MANY_PLACEHOLDER.format(field=field, row=row)
+
+    @classmethod
+    def bulk_insert_sql(cls, name_table: str, fields_name: List[str]) -> str:
+        return BULK_INSERT_SQL.format(
             table=name_table,
-            fields_values=", ".join(fields_values),
-            conditions=", ".join(conditions),
+            fields_name=", ".join(fields_name),
+            placeholders=", ".join("${index}".format(index=index + 1) for index in range(len(fields_name))),
         )
 
     @classmethod
-    def select_sql(cls, name_table: str, fields: List[str], conditions: str, limit: int | None = None) -> str:
-        sql = SELECT_TABLE_WHERE_SQL
-        if limit is not None:
-            sql += LIMIT_SQL
+    def update_sql(
+        cls,
+        name_table: str,
+        fields_values: List[str],
+        conditions: List[str],
+        returning: List[str] | None = None,
+    ):
+        key = (cls, "update", name_table, tuple(fields_values), tuple(conditions), tuple(returning or ()))
+        return statement_cache.get(
+            key,
+            lambda: UPDATE_SQL.format(
+                table=name_table,
+                fields_values=", ".join(fields_values),
+                conditions=", ".join(conditions),
+                returning=RETURNING_SQL.format(name_id=", ".join(returning)) if returning else "",
+            ),
+        )
 
-        return sql.format(
+    @classmethod
+    def select_sql(
+        cls,
+        name_table: str,
+        fields: List[str],
+        conditions: str,
+        limit: int | None = None,
+        joins: List[Dict[str, Any]] | None = None,
+        order_by: List[str] | None = None,
+        offset: int | None = None,
+        annotations: Dict[str, str] | None = None,
+    ) -> str:
+        key = (
+            cls,
+            "select",
+            name_table,
+            tuple(fields),
+            conditions,
+            limit,
+            cls.__joins_key(joins),
+            tuple(order_by or ()),
+            offset,
+            tuple((annotations or {}).items()),
+        )
+        return statement_cache.get(
+            key, lambda: cls.__select_sql(name_table, fields, conditions, limit, joins, order_by, offset, annotations)
+        )
+
+    @classmethod
+    def __joins_key(cls, joins: List[Dict[str, Any]] | None) -> Tuple:
+        if not joins:
+            return ()
+        return tuple((join["name"], join["table"], join["field"], tuple(join["fields"])) for join in joins)
+
+    @classmethod
+    def __select_sql(
+        cls,
+        name_table: str,
+        fields: List[str],
+        conditions: str,
+        limit: int | None,
+        joins: List[Dict[str, Any]] | None,
+        order_by: List[str] | None,
+        offset: int | None,
+        annotations: Dict[str, str] | None,
+    ) -> str:
+        fields_select = list(fields)
+        if annotations:
+            fields_select.extend(
+                ANNOTATION_SQL.format(expression=expression, alias=alias) for alias, expression in annotations.items()
+            )
+        sql = SELECT_TABLE_WHERE_SQL.format(
             table=name_table,
-            fields=", ".join(fields),
+            fields=", ".join(fields_select),
             conditions=conditions,
-            limit=limit,
         )
+        if order_by:
+            sql += cls.order_by_sql(order_by)
+        sql += cls.limit_sql(limit, offset)
+        if joins:
+            sql = cls.select_join_sql(name_table, [*fields, *(annotations or {})], sql, joins, order_by)
+        return sql
 
     @classmethod
-    def select_last_id(cls, name_id: str, table: str):
-        return SELECT_LAST_ID_ORDER_BY_SQL.format(name_id=name_id, table=table)
+    def select_relation_sql(
+        cls,
+        name_table: str,
+        fields: List[str],
+        name_id: str,
+        relation_table: str,
+        relation_field: str,
+        conditions: str,
+        limit: int | None = None,
+        order_by: List[str] | None = None,
+        offset: int | None = None,
+        relation_key: str | None = None,
+    ) -> str:
+        key = (
+            cls,
+            "select_relation",
+            name_table,
+            tuple(fields),
+            name_id,
+            relation_table,
+            relation_field,
+            conditions,
+            limit,
+            tuple(order_by or ()),
+            offset,
+            relation_key,
+        )
+        return statement_cache.get(
+            key,
+            lambda: cls.__select_relation_sql(
+                name_table,
+                fields,
+                name_id,
+                relation_table,
+                relation_field,
+                conditions,
+                limit,
+                order_by,
+                offset,
+                relation_key,
+            ),
+        )
+
+    @classmethod
+    def __select_relation_sql(
+        cls,
+        name_table: str,
+        fields: List[str],
+        name_id: str,
+        relation_table: str,
+        relation_field: str,
+        conditions: str,
+        limit: int | None,
+        order_by: List[str] | None,
+        offset: int | None,
+        relation_key: str | None,
+    ) -> str:
+        fields_select = [FIELD_ALIAS_SQL.format(table=name_table, field=field, alias=field) for field in fields]
+        if relation_key:
+            alias = cls.relation_key_alias(relation_key)
+            fields_select.append(FIELD_ALIAS_SQL.format(table=relation_table, field=relation_key, alias=alias))
+
+        sql = SELECT_RELATION_SQL.format(
+            fields=", ".join(fields_select),
+            table=name_table,
+            table_relation=relation_table,
+            field=relation_field,
+            name=name_id,
+            conditions=conditions,
+        )
+        if order_by:
+            sql += cls.order_by_sql(order_by, name_table)
+        return sql + cls.limit_sql(limit, offset)
+
+    @classmethod
+    def count_relation_sql(cls, name_table: str, name_id: str, relation_table: str, relation_field: str) -> str:
+        return COUNT_RELATION_SQL.format(
+            table_relation=relation_table,
+            field=relation_field,
+            table=name_table,
+            name=name_id,
+        )
+
+    @classmethod
+    def relation_key_alias(cls, field: str) -> str:
+        return RELATION_KEY_ALIAS.format(field=field)
+
+    @classmethod
+    def list_param_sql(cls, field: str, operator: str, param: str, value: List[Any]) -> Tuple[str, Any] | None:
+        return None
+
+    @classmethod
+    def order_by_sql(cls, order_by: List[str], name_table: str | None = None) -> str:
+        fields = []
+        for field in order_by:
+            name = field.lstrip("-")
+            if name_table:
+                name = "{table}.{field}".format(table=name_table, field=name)
+            fields.append(name + " DESC" if field.startswith("-") else name)
+        return ORDER_BY_SQL.format(fields=", ".join(fields))
+
+    @classmethod
+    def limit_sql(cls, limit: int | None = None, offset: int | None = None) -> str:
+        sql = ""
+        if limit is not None:
+            sql += LIMIT_SQL.format(limit=int(limit))
+        if offset:
+            sql += OFFSET_SQL.format(offset=int(offset))
+        return sql
+
+    @classmethod
+    def keyset_sql(cls, fields: List[str], after: Tuple, descending: bool = False) -> Tuple[str, Dict[str, Any]]:
+        placeholders = [KEYSET_PLACEHOLDER.format(index=index) for index in range(len(fields))]
+        sql = KEYSET_SQL.format(
+            fields=", ".join(fields),
+            operator="<" if descending else ">",
+            placeholders=", ".join(":" + placeholder for placeholder in placeholders),
+        )
+        return sql, dict(zip(placeholders, after))
+
+    @classmethod
+    def select_join_sql(
+        cls,
+        name_table: str,
+        fields: List[str],
+        select: str,
+        joins: List[Dict[str, Any]],
+        order_by: List[str] | None = None,
+    ) -> str:
+        fields_select = [FIELD_ALIAS_SQL.format(table=name_table, field=field, alias=field) for field in fields]
+        joins_sql = []
+        for join in joins:
+            alias = RELATED_ALIAS.format(name=join["name"])
+            for field in join["fields"]:
+                field_alias = RELATED_FIELD_ALIAS.format(name=join["name"], field=field)
+                fields_select.append(FIELD_ALIAS_SQL.format(table=alias, field=field, alias=field_alias))
+            joins_sql.append(
+                LEFT_JOIN_SQL.format(
+                    table_relation=join["table"],
+                    alias=alias,
+                    field=join["field"],
+                    table=name_table,
+                    name=join["name"],
+                )
+            )
+
+        sql = SELECT_JOIN_SQL.format(
+            fields=", ".join(fields_select),
+            select=select,
+            table=name_table,
+            joins="".join(joins_sql),
+        )
+        if order_by:
+            sql += cls.order_by_sql(order_by, name_table)
+        return sql
+
+    @classmethod
+    def count_sql(cls, name_table: str, conditions: str) -> str:
+        key = (cls, "count", name_table, conditions)
+        return statement_cache.get(key, lambda: COUNT_SQL.format(table=name_table, conditions=conditions))
+
+    @classmethod
+    def exists_sql(cls, name_table: str, conditions: str) -> str:
+        key = (cls, "exists", name_table, conditions)
+        return statement_cache.get(key, lambda: EXISTS_SQL.format(table=name_table, conditions=conditions))
+
+    @classmethod
+    def aggregate_sql(
+        cls,
+        name_table: str,
+        aggregates: List[Tuple[str, str]],
+        conditions: str,
+        group_by: List[str] | None = None,
+    ) -> str:
+        key = (cls, "aggregate", name_table, tuple(aggregates), conditions, tuple(group_by or ()))
+        return statement_cache.get(key, lambda: cls.__aggregate_sql(name_table, aggregates, conditions, group_by))
+
+    @classmethod
+    def __aggregate_sql(
+        cls,
+        name_table: str,
+        aggregates: List[Tuple[str, str]],
+        conditions: str,
+        group_by: List[str] | None,
+    ) -> str:
+        fields = list(group_by or [])
+        for function, field in aggregates:
+            alias = cls.aggregate_alias(function, field)
+            fields.append(AGGREGATE_FIELD_SQL.format(function=function.upper(), field=field, alias=alias))
+
+        sql = SELECT_TABLE_WHERE_SQL.format(table=name_table, fields=", ".join(fields), conditions=conditions)
+        if group_by:
+            sql += GROUP_BY_SQL.format(fields=", ".join(group_by))
+        return sql + ";"
+
+    @classmethod
+    def aggregate_alias(cls, function: str, field: str) -> str:
+        return AGGREGATE_ALIAS.format(function=function, field=field)
+
+    @classmethod
+    def related_field_alias(cls, name: str, field: str) -> str:
+        return RELATED_FIELD_ALIAS.format(name=name, field=field)
 
     @classmethod
     def delete_sql(cls, name_table: str, conditions: str):
-        return DELETE_SQL.format(table=name_table, conditions=conditions)
+        key = (cls, "delete", name_table, conditions)
+        return statement_cache.get(key, lambda: DELETE_SQL.format(table=name_table, conditions=conditions))
+
+    @classmethod
+    def delete_chunk_sql(cls, name_table: str, name_id: str, conditions: str, limit: int):
+        key = (cls, "delete_chunk", name_table, name_id, conditions, limit)
+        return statement_cache.get(
+            key,
+            lambda: DELETE_CHUNK_SQL.format(table=name_table, name_id=name_id, conditions=conditions, limit=limit),
+        )
+
+    @classmethod
+    def count_changes_sql(cls, statement: str) -> Tuple[str, str | None]:
+        key = (cls, "count_changes", statement)
+        return (
+            statement_cache.get(key, lambda: COUNT_CHANGES_SQL.format(statement=statement.rstrip(";"))),
+            None,
+        )
 
     @classmethod
     def drop_table(cls, name_table: str, cascade: bool = False):
@@ -123,6 +521,10 @@ class QueryExecutor:
     def select_tables_sql(cls):
         return SELECT_TABLES_SQL
 
+    @classmethod
+    def converters(cls, columns: Mapping[str, Any]) -> Dict[str, Callable[[Any], Any]]:
+        return {}
+
     @classmethod
     def parser(cls, row: Mapping, fields: List[str] = [], fields_foreign_key: dict = {}) -> dict:
         entity = {}
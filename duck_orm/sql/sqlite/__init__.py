@@ -1,10 +1,16 @@
+import json
+import sqlite3
 from datetime import datetime
-from typing import List, Mapping
+from typing import Any, Callable, Dict, List, Mapping, Tuple
 
-from duck_orm.sql.sql import QueryExecutor
+from duck_orm.sql.sql import BULK_INSERT_SQL, QueryExecutor
 
 SELECT_TABLES_SQL = "SELECT name FROM sqlite_master where type = 'table';"
 DROP_TABLE_SQL = "DROP TABLE IF EXISTS {name};"
+CHANGES_SQL = "SELECT changes();"
+JSON_EACH_SQL = "{field} {operator} (SELECT CAST(value AS TEXT) FROM json_each(:{param}))"
+JSON_TYPES = (str, int, float)
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
 TYPES_SQL = {
     "str": "TEXT",
     "int": "INTEGER",
@@ -17,15 +23,61 @@ TYPES_SQL = {
 }
 
 
+def parse_timestamp(value: str) -> datetime:
+    return datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+def has_json_each() -> bool:
+    connection = sqlite3.connect(":memory:")
+    try:
+        connection.execute("SELECT value FROM json_each('[]');")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        connection.close()
+
+
 class QuerySQLite(QueryExecutor):
+    supports_returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+    supports_json_each = has_json_each()
+
     @classmethod
     def drop_table(cls, name_table: str, cascade: bool = False):
         return DROP_TABLE_SQL.format(name=name_table)
 
+    @classmethod
+    def limit_sql(cls, limit: int | None = None, offset: int | None = None) -> str:
+        if offset and limit is None:
+            limit = -1
+        return super().limit_sql(limit, offset)
+
+    @classmethod
+    def bulk_insert_sql(cls, name_table: str, fields_name: List[str]) -> str:
+        return BULK_INSERT_SQL.format(
+            table=name_table,
+            fields_name=", ".join(fields_name),
+            placeholders=", ".join("?" for _ in fields_name),
+        )
+
+    @classmethod
+    def list_param_sql(cls, field: str, operator: str, param: str, value: List[Any]) -> Tuple[str, Any] | None:
+        if not cls.supports_json_each or not all(isinstance(item, JSON_TYPES) for item in value):
+            return None
+        return JSON_EACH_SQL.format(field=field, operator=operator, param=param), json.dumps(list(value))
+
+    @classmethod
+    def count_changes_sql(cls, statement: str) -> Tuple[str, str | None]:
+        return statement, CHANGES_SQL
+
+    @classmethod
+    def converters(cls, columns: Mapping[str, Any]) -> Dict[str, Callable[[Any], Any]]:
+        return {name: parse_timestamp for name, field in columns.items() if field.type == "timestamp"}
+
     @classmethod
     def parser(cls, row: Mapping, fields: List[str] = [], fields_foreign_key={}) -> dict:
         entity = {}
-        if fields != []:
+        if fields:
             for field in fields:
                 field_type = None
                 if isinstance(field, tuple):
@@ -36,7 +88,7 @@ class QuerySQLite(QueryExecutor):
                     value = row[field]
                     if value is not None:
                         if field_type:
-                            entity[field] = datetime.strptime(value, "%Y-%m-%d %H:%M:%S.%f")
+                            entity[field] = parse_timestamp(value)
                         elif field in fields_foreign_key.keys():
                             entity[field] = fields_foreign_key.get(field)
                         else:
@@ -46,7 +98,7 @@ class QuerySQLite(QueryExecutor):
                     else:
                         entity[field] = None
                 except KeyError:
-                    entity[field] = None
+                    entity[field] = fields_foreign_key.get(field)
 
         else:
             for key, value in row.items():
@@ -1,17 +1,22 @@
 import logging
+from typing import Dict
 
 from duck_orm.sql.postgres import QueryPostgres
 from duck_orm.sql.sql import QueryExecutor
 from duck_orm.sql.sqlite import QuerySQLite
 
 
-def get_dialect(dialect: str) -> QueryExecutor:
-    if dialect == "postgresql":
-        return QueryPostgres()
-    elif dialect == "sqlite":
-        return QuerySQLite()
+DIALECTS: Dict[str, QueryExecutor] = {
+    "postgresql": QueryPostgres(),
+    "sqlite": QuerySQLite(),
+}
+
 
-    raise Exception(f"Dialect {dialect} not supported!")
+def get_dialect(dialect: str) -> QueryExecutor:
+    query_executor = DIALECTS.get(dialect)
+    if query_executor is None:
+        raise Exception(f"Dialect {dialect} not supported!")
+    return query_executor
 
 
 def load_path(dir_migration):
@@ -0,0 +1,19 @@
+import pytest
+from databases.core import Database
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """
+    Records the SQL sent with fetch_all and execute by any database.
+    """
+    queries = []
+    for name in ("fetch_all", "execute"):
+        method = getattr(Database, name)
+
+        async def record(self, query, values=None, method=method):
+            queries.append(query)
+            return await method(self, query=query, values=values)
+
+        monkeypatch.setattr(Database, name, record)
+    return queries
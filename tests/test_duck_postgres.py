@@ -111,6 +111,29 @@ async def test_create_table():
     await db.disconnect()
 
 
+@pytest.mark.asyncio
+async def test_save_many():
+    await db.connect()
+    tests = [MyTest(msg=f"Many {index}") for index in range(5)]
+    tests = await MyTest.save_many(tests, batch_size=2)
+    assert [test.id for test in tests] == [1, 2, 3, 4, 5]
+    tests_db = await MyTest.find_all()
+    assert sorted((test.id, test.msg) for test in tests_db) == [(index + 1, f"Many {index}") for index in range(5)]
+    await db.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_copy_from():
+    await db.connect()
+    count = await MyTest.copy_from([MyTest(msg="Copy 1"), {"msg": "Copy 2"}, ("Copy 3",)])
+    assert count == 3
+    count = await model_manager.bulk_load(MyTest, [{"msg": "Copy 4"}])
+    assert count == 1
+    tests = await MyTest.find_all(conditions=[Condition("msg", "LIKE", "Copy%")], order_by=["id"])
+    assert [test.msg for test in tests] == ["Copy 1", "Copy 2", "Copy 3", "Copy 4"]
+    await db.disconnect()
+
+
 @pytest.mark.asyncio
 async def test_save_person():
     await db.connect()
@@ -166,8 +189,9 @@ async def test_sql_select_where_persons():
     assert fields.__contains__("first_name")
     assert fields.__contains__("last_name")
     assert fields.__contains__("salary")
-    msg = "SELECT {fields} FROM persons WHERE first_name = 'Rich'".format(fields=fields)
+    msg = "SELECT {fields} FROM persons WHERE first_name = :param_0".format(fields=fields)
     assert sql[0] == msg
+    assert sql[2] == {"param_0": "Rich"}
     await db.disconnect()
 
 
@@ -214,7 +238,8 @@ async def test_find_by_id_invalid():
 @pytest.mark.asyncio
 async def test_delete_person():
     await db.connect()
-    await Person.delete(conditions=[Condition("first_name", "=", "Rich")])
+    count = await Person.delete(conditions=[Condition("first_name", "=", "Rich")])
+    assert count == 1
     persons = await Person.find_all()
     assert len(persons) == 2
     assert persons[0].first_name == "Lucas"
@@ -1,5 +1,6 @@
 import asyncio
 import functools
+from datetime import datetime
 
 import pytest
 from databases.core import Database
@@ -8,8 +9,13 @@ from duck_orm.exceptions import UpdateException
 from duck_orm.model import Model
 from duck_orm.model_manager import ModelManager
 from duck_orm.sql import fields as Field
-from duck_orm.sql.condition import Condition
+from duck_orm.sql.cache import ResultCache, statement_cache
+from duck_orm.sql.condition import Condition, Q, compile_conditions
+from duck_orm.sql.expression import F, compile_set
 from duck_orm.sql.relationship import ForeignKey
+from duck_orm.sql.postgres import QueryPostgres
+from duck_orm.sql.sqlite import QuerySQLite
+from duck_orm.utils.functions import get_dialect
 
 db = Database("sqlite:///example.db")
 
@@ -24,6 +30,13 @@ class MyTest(Model):
     msg: str = Field.String(not_null=True)
 
 
+class Counter(Model):
+    __db__ = db
+
+    id: int = Field.BigInteger(primary_key=True)
+    value: int = Field.Integer()
+
+
 class Person(Model):
     __tablename__ = "persons"
     __db__ = db
@@ -107,6 +120,60 @@ def test_create_sql_son():
     )
 
 
+def test_condition_compile():
+    sql, values = Condition("first_name", "=", "O'Neil").compile(1)
+    assert sql == "first_name = :param_1"
+    assert values == {"param_1": "O'Neil"}
+
+    sql, values = Condition("id", "IN", [1, 2]).compile()
+    assert sql == "id IN (:param_0_0, :param_0_1)"
+    assert values == {"param_0_0": 1, "param_0_1": 2}
+
+    sql, values = Condition("first_name", "LIKE", "rich", True).compile()
+    assert sql == "LOWER(first_name) LIKE LOWER(:param_0)"
+
+    sql, values = compile_conditions(
+        [
+            Q(Condition("age", "<", 18)) | ~Q(Condition("salary", "BETWEEN", (10, 20))),
+            Condition("alive", "IS NULL"),
+            Condition("first_name", "!=", "Rich"),
+        ]
+    )
+    assert sql == (
+        "(age < :param_0 OR NOT (salary BETWEEN :param_1_0 AND :param_1_1)) and alive IS NULL and first_name != :param_3"
+    )
+    assert values == {"param_0": 18, "param_1_0": 10, "param_1_1": 20, "param_3": "Rich"}
+
+    assert compile_conditions([Q(), Condition("id", "=", 1) | Q()]) == ("id = :param_0", {"param_0": 1})
+
+    sql, values = Condition("id", "IN", [1, 2]).compile(0, QuerySQLite)
+    assert sql == "id IN (SELECT CAST(value AS TEXT) FROM json_each(:param_0))"
+    assert values == {"param_0": "[1, 2]"}
+    sql, values = Condition("id", "NOT IN", [1, 2]).compile(0, QueryPostgres)
+    assert sql == "id <> ALL(:param_0)"
+    assert values == {"param_0": [1, 2]}
+
+
+def test_statement_cache():
+    statement_cache.clear()
+    sql_rich = Person._Model__get_select_sql(conditions=[Condition("first_name", "=", "Rich")])
+    sql_lucas = Person._Model__get_select_sql(conditions=[Condition("first_name", "=", "Lucas")])
+    assert sql_rich[0] is sql_lucas[0]
+    assert statement_cache.info()["misses"] == 1
+    assert statement_cache.info()["hits"] == 1
+    assert get_dialect("sqlite") is get_dialect("sqlite")
+
+
+def test_schema_cached():
+    schema = Person.get_schema()
+    assert Person.get_schema() is schema
+    assert schema.primary_key[0] == "id"
+    assert schema.fields == ("age", "alive", "first_name", "id", "last_name", "salary")
+    assert schema.foreign_keys == ()
+    with pytest.raises(AttributeError):
+        schema.fields = ()
+
+
 def get_table(table, tables):
     return any((tup["name"] == table) for tup in tables)
 
@@ -123,6 +190,54 @@ async def test_create_table():
     assert get_table("mytest", tables)
 
 
+@async_decorator
+async def test_save_many(monkeypatch):
+    fetch_all = db.fetch_all
+
+    async def reversed_fetch_all(query, values=None):
+        return list(reversed(await fetch_all(query=query, values=values)))
+
+    monkeypatch.setattr(db, "fetch_all", reversed_fetch_all)
+    tests = [MyTest(msg=f"Many {index}") for index in range(5)]
+    tests = await MyTest.save_many(tests, batch_size=2)
+    monkeypatch.undo()
+    assert [test.id for test in tests] == [1, 2, 3, 4, 5]
+    tests_db = await MyTest.find_all()
+    assert [(test.id, test.msg) for test in tests_db] == [(index + 1, f"Many {index}") for index in range(5)]
+
+
+def test_insert_returning_sql():
+    sql, values = MyTest(msg="Returning")._Model__get_insert_sql(returning="id")
+    assert sql == "INSERT INTO mytest(msg) VALUES(:msg) RETURNING id;"
+    assert values == {"msg": "Returning"}
+
+
+@async_decorator
+async def test_save_without_returning(monkeypatch):
+    monkeypatch.setattr(QuerySQLite, "supports_returning", False)
+    test = await MyTest.save(MyTest(msg="Without returning"))
+    tests = await MyTest.save_many([MyTest(msg="Many 5"), MyTest(msg="Many 6")])
+    assert test.id == 6
+    assert [test.id for test in tests] == [7, 8]
+
+    await Counter.create()
+    counter = await Counter.save(Counter(value=1))
+    counters = await Counter.save_many([Counter(value=2), Counter(value=3)])
+    assert [counter.id for counter in [counter, *counters]] == [1, 2, 3]
+    assert (await Counter.find_by_id(3)).value == 3
+    await Counter.drop_table()
+
+
+@async_decorator
+async def test_copy_from():
+    count = await MyTest.copy_from([MyTest(msg="Copy 1"), {"msg": "Copy 2"}, ("Copy 3",)], batch_size=2)
+    assert count == 3
+    count = await model_manager.bulk_load(MyTest, [{"msg": "Copy 4"}])
+    assert count == 1
+    tests = await MyTest.find_all(conditions=[Condition("msg", "LIKE", "Copy%")])
+    assert [test.msg for test in tests] == ["Copy 1", "Copy 2", "Copy 3", "Copy 4"]
+
+
 @async_decorator
 async def test_save_person():
     t = MyTest(msg="Teste 1")
@@ -167,8 +282,9 @@ async def test_sql_select_where_persons():
     assert fields.__contains__("first_name")
     assert fields.__contains__("last_name")
     assert fields.__contains__("salary")
-    msg = "SELECT {fields} FROM persons WHERE first_name = 'Rich'".format(fields=fields)
+    msg = "SELECT {fields} FROM persons WHERE first_name = :param_0".format(fields=fields)
     assert sql[0] == msg
+    assert sql[2] == {"param_0": "Rich"}
 
 
 @async_decorator
@@ -188,6 +304,98 @@ async def test_select_all_limit():
     assert persons[1].first_name == "Lucas"
 
 
+@async_decorator
+async def test_select_order_by_offset():
+    persons = await Person.find_all(order_by=["-id"], limit=2)
+    assert [person.first_name for person in persons] == ["Teste 1", "Lucas"]
+    persons = await Person.find_all(order_by=["first_name"], offset=1)
+    assert [person.first_name for person in persons] == ["Rich", "Teste 1"]
+    with pytest.raises(Exception):
+        await Person.find_all(order_by=["salary; DROP TABLE persons"])
+
+
+@async_decorator
+async def test_paginate():
+    page = await Person.paginate(page_size=2)
+    assert [person.id for person in page] == [1, 2]
+    page = await Person.paginate(after=page[-1].id, page_size=2)
+    assert [person.id for person in page] == [3]
+    page = await Person.paginate(after=(21, 1), order_by=["age", "id"])
+    assert [person.id for person in page] == [2, 3]
+    page = await Person.paginate(after=3, order_by="-id")
+    assert [person.id for person in page] == [2, 1]
+
+    ages = {person.id: person.age for person in await Person.find_all()}
+    await Person.update_where([Condition("id", ">", 0)], age=20)
+    ids = []
+    page = await Person.paginate(order_by="age", page_size=1)
+    while page:
+        ids.extend(person.id for person in page)
+        page = await Person.paginate(after=(page[-1].age, page[-1].id), order_by="age", page_size=1)
+    assert ids == [1, 2, 3]
+    with pytest.raises(Exception):
+        await Person.paginate(after=20, order_by="age")
+    for person in await Person.find_all():
+        await person.update(refresh=False, age=ages[person.id])
+
+
+@async_decorator
+async def test_count_exists_aggregate():
+    assert await Person.count() == 3
+    assert await Person.count(conditions=[Condition("salary", ">=", 20000000)]) == 2
+    assert await Person.exists(conditions=[Condition("first_name", "=", "Lucas")])
+    assert not await Person.exists(conditions=[Condition("first_name", "=", "Nobody")])
+
+    result = await Person.aggregate(sum="salary", max=["salary", "age"], min="salary")
+    assert result == {"sum_salary": 50000000, "max_salary": 20000000, "max_age": 21, "min_salary": 10000000}
+    result = await Person.aggregate(avg="salary", group_by=["age"])
+    assert result == [{"age": 21, "avg_salary": 50000000 / 3}]
+    with pytest.raises(Exception):
+        await Person.aggregate(median="salary")
+
+
+@async_decorator
+async def test_find_q():
+    persons = await Person.find_all(
+        conditions=[Condition("first_name", "=", "Rich") | Condition("id", ">", 2)], order_by=["id"]
+    )
+    assert [person.id for person in persons] == [1, 3]
+
+    persons = await Person.find_all(conditions=[~Q(Condition("salary", "BETWEEN", (15000000, 25000000)))])
+    assert [person.first_name for person in persons] == ["Rich"]
+    assert await Person.count([Condition("alive", "IS NULL") & Condition("age", "!=", 21)]) == 0
+
+    persons = await Person.find_all(conditions=[Condition("id", "IN", list(range(1, 50001)))])
+    assert len(persons) == 3
+    assert await Person.count([Condition("first_name", "NOT IN", ["Rich", "Lucas"])]) == 1
+
+    await MyTest.save(MyTest(msg="7"))
+    assert await MyTest.count([Condition("msg", "IN", [7, 8.5])]) == 1
+    assert await MyTest.count([Condition("msg", "NOT IN", [7])]) == await MyTest.count() - 1
+    assert await Person.count([Condition("id", "IN", ["1", 2])]) == 2
+    await MyTest.delete([Condition("msg", "=", 7)])
+
+
+@async_decorator
+async def test_values():
+    persons = await Person.values(["id", "first_name"], order_by=["id"])
+    assert persons == [
+        {"id": 1, "first_name": "Rich"},
+        {"id": 2, "first_name": "Lucas"},
+        {"id": 3, "first_name": "Teste 1"},
+    ]
+    persons = await Person.values_list(["first_name", "id"], conditions=[Condition("id", ">=", 2)])
+    assert persons == [("Lucas", 2), ("Teste 1", 3)]
+    names = await Person.values_list(["first_name"], order_by=["-id"], limit=2, flat=True)
+    assert names == ["Teste 1", "Lucas"]
+
+
+def test_sqlite_converters():
+    converters = QuerySQLite.converters({"created": Field.Timestamp(), "name": Field.String()})
+    assert list(converters) == ["created"]
+    assert converters["created"]("2021-05-17 10:30:00.000000") == datetime(2021, 5, 17, 10, 30)
+
+
 @async_decorator
 async def test_find_by_id_success():
     person = await Person.find_by_id(1)
@@ -203,9 +411,77 @@ async def test_find_by_id_invalid():
     assert person is None
 
 
+def test_result_cache():
+    cache = ResultCache(maxsize=2, ttl=None)
+    cache.set("a", ("persons",), [1])
+    cache.set("b", ("sons",), [2])
+    cache.set("c", ("sons",), [3])
+    assert cache.get("a") == (False, None)
+    assert cache.get("b") == (True, [2])
+    cache.invalidate("sons")
+    assert cache.get("c") == (False, None)
+    assert cache.info()["evictions"] == 1
+
+    cache = ResultCache(ttl=0)
+    cache.set("a", ("persons",), [1])
+    assert cache.get("a") == (False, None)
+
+
+@async_decorator
+async def test_find_cached(monkeypatch):
+    monkeypatch.setattr(Person, "__cache__", {"maxsize": 16, "ttl": 60})
+    cache = Person.get_cache()
+    cache.clear()
+
+    person = await Person.find_by_id(2)
+    person = await Person.find_by_id(2)
+    assert person.first_name == "Lucas"
+    assert cache.info()["hits"] == 1
+    assert cache.info()["misses"] == 1
+
+    await MyTest.save(MyTest(msg="Not a person"))
+    await Person.find_by_id(2)
+    assert cache.info()["hits"] == 2
+
+    await person.update(age=22)
+    person = await Person.find_by_id(2)
+    assert person.age == 22
+    await person.update(age=21)
+
+
+@async_decorator
+async def test_update_where_delete_chunked():
+    await MyTest.save_many([MyTest(msg="pending") for _ in range(5)])
+    count = await MyTest.update_where([Condition("msg", "=", "pending")], msg="done")
+    assert count == 5
+    assert await MyTest.update_where([Condition("msg", "=", "pending")], msg="done") == 0
+
+    sql, _ = MyTest._Model__delete([Condition("msg", "=", "done")], "sqlite", chunk_size=2)
+    assert sql == (
+        "DELETE FROM mytest WHERE id IN (SELECT id FROM mytest WHERE msg = :param_0 LIMIT 2);"
+    )
+    assert await MyTest.delete([Condition("msg", "=", "done")], chunk_size=2) == 5
+    assert await MyTest.count([Condition("msg", "=", "done")]) == 0
+
+    with pytest.raises(Exception):
+        await MyTest.delete([Condition("unknown", "=", 1)])
+
+    total = await MyTest.count()
+    with pytest.raises(Exception, match="Conditions are required"):
+        await MyTest.delete([])
+    with pytest.raises(Exception, match="Conditions are required"):
+        await MyTest.update_where([], msg="done")
+    with pytest.raises(Exception, match="Conditions are required"):
+        await MyTest.delete([Q(), Q(Q()) | Q()])
+    with pytest.raises(Exception, match="Conditions are required"):
+        await MyTest.update_where([~Q()], msg="done")
+    assert await MyTest.count() == total
+
+
 @async_decorator
 async def test_delete_person():
-    await Person.delete(conditions=[Condition("first_name", "=", "Rich")])
+    count = await Person.delete(conditions=[Condition("first_name", "=", "Rich")])
+    assert count == 1
     persons = await Person.find_all()
     assert len(persons) == 2
     assert persons[0].first_name == "Lucas"
@@ -261,6 +537,80 @@ async def test_update_sql_without_id():
     assert person.last_name == "UPDATE"
 
 
+@async_decorator
+async def test_flush(queries):
+    person = await Person.find_by_id(2)
+    queries.clear()
+    assert person.get_changed_fields() == []
+    assert await person.flush() is person
+    assert queries == []
+
+    person.age = 30
+    assert person.get_changed_fields() == ["age"]
+    assert await person.flush() is person
+    assert queries == ["UPDATE persons SET age = :age WHERE id = :param_0;"]
+    assert person.get_changed_fields() == []
+    assert (await Person.find_by_id(2)).age == 30
+
+    person.age = 31
+    assert (await person.flush(refresh=True)).age == 31
+    assert person.get_changed_fields() == []
+
+    assert await person.update(refresh=False, age=21) is person
+    assert person.age == 21
+
+
+def test_expression_compile():
+    fields, values = compile_set({"views": F("views") + 1, "score": (F("score") - 2) * F("rate"), "name": "x"})
+    assert fields == ["views = views + :expr_0", "score = (score - :expr_1) * rate", "name = :name"]
+    assert values == {"name": "x", "expr_0": 1, "expr_1": 2}
+
+
+@async_decorator
+async def test_update_expressions(monkeypatch):
+    person = await Person.find_by_id(2)
+    assert await person.update(refresh=False, age=F("age") + 1) is person
+    assert person.age == 22
+
+    monkeypatch.setattr(QuerySQLite, "supports_returning", False)
+    await person.update(refresh=False, age=F("age") + 1)
+    assert person.age == 23
+    monkeypatch.undo()
+
+    count = await Person.update_where([Condition("id", "=", 2)], age=F("age") - 2, salary=F("salary") * 2)
+    assert count == 1
+    person = await Person.find_by_id(2)
+    assert person.age == 21
+    assert person.salary == 40000000
+
+
+@async_decorator
+async def test_upsert():
+    sql = QuerySQLite.upsert_sql("persons", ["first_name", "age"], 2, ["first_name"], ["age"], "id, first_name")
+    assert sql == (
+        "INSERT INTO persons(first_name, age) VALUES (:first_name_0, :age_0), (:first_name_1, :age_1) "
+        "ON CONFLICT (first_name) DO UPDATE SET age = excluded.age RETURNING id, first_name;"
+    )
+
+    persons = await Person.upsert(
+        [
+            Person(first_name="Lucas", last_name="Lucas Andrade", age=30),
+            Person(first_name="Naruto", last_name="Uzumaki", age=16),
+        ],
+        conflict_columns=["first_name"],
+        update_columns=["age"],
+    )
+    assert persons[0].id == 2
+    assert persons[1].id is not None
+    assert (await Person.find_by_id(2)).age == 30
+
+    person = Person(first_name="Lucas", last_name="Other", age=1)
+    await Person.upsert(person, conflict_columns=["first_name"], update_columns=[])
+    person = await Person.find_by_id(2)
+    assert person.age == 30
+    assert person.last_name == "Lucas Andrade"
+
+
 @async_decorator
 async def test_drop_table():
     await model_manager.drop_all_tables()
@@ -3,11 +3,17 @@ import functools
 import asyncio
 import pytest
 
+from duck_orm.exceptions import LazyLoadException
 from duck_orm.model import Model
 from duck_orm.model_manager import ModelManager
+from duck_orm.session import Session
+from duck_orm.sql.cache import statement_cache
+from duck_orm.sql.condition import Condition
+from duck_orm.sql.expression import Count
 from duck_orm.sql import fields as Field
 from duck_orm.sql.relationship import (
     ForeignKey,
+    LazyModel,
     ManyToMany,
     OneToOne,
     OneToMany
@@ -179,6 +185,13 @@ def test_model_class():
     assert isinstance(UsersWorkingDay.working_days, ForeignKey)
 
 
+def test_schema_relationships():
+    assert [name for name, _ in Person.get_schema().foreign_keys] == ['city']
+    assert [name for name, _ in City.get_schema().relations] == ['persons']
+    assert Contact.get_id()[0] == 'id_person'
+    assert Contact.get_schema() is Contact.get_schema()
+
+
 @async_decorator
 async def test_save_city():
     global city_cg
@@ -238,6 +251,146 @@ async def test_save_contact():
         contact_error = await Contact.save(contact_error)
 
 
+@async_decorator
+async def test_find_all_batch_relations():
+    persons = await Person.find_all()
+    persons_unbatched = await Person.find_all(batch_relations=False)
+    assert [person.city.name for person in persons] == ['Konoha'] * 3
+    assert [person.city.id for person in persons] == \
+        [person.city.id for person in persons_unbatched]
+
+    contacts = await Contact.find_all()
+    assert [contact.id_person.first_name for contact in contacts] == \
+        ['Rich', 'Elton']
+
+
+@async_decorator
+async def test_find_all_null_foreign_key():
+    person = await Person.save(
+        Person(first_name='Gaara', last_name='Sabaku', age=16, salary=100))
+    condition = Condition('id_teste', '=', person.id_teste)
+    for batch_relations in (True, False):
+        persons = await Person.find_all(
+            conditions=[condition], batch_relations=batch_relations)
+        assert persons[0].city is None
+    await Person.delete(conditions=[condition])
+
+
+@async_decorator
+async def test_find_all_loading():
+    persons = await Person.find_all(loading='none')
+    assert [person.city for person in persons] == [city_kh.id] * 3
+
+    persons = await Person.find_all(loading=Field.LoadingEnum.LAZY)
+    assert isinstance(persons[0].city, LazyModel)
+    assert persons[0].city.id == city_kh.id
+    with pytest.raises(LazyLoadException):
+        persons[0].city.name
+
+    city = await persons[0].city
+    assert city.name == 'Konoha'
+    assert persons[0].city.name == 'Konoha'
+
+
+def test_select_related_sql():
+    sql, fields, _ = Person._Model__get_select_sql(
+        fields_includes=['first_name'], select_related=['city'])
+    assert fields == ['first_name', 'city']
+    assert sql == "SELECT persons.first_name AS first_name, " + \
+        "persons.city AS city, " + \
+        "related_city.id AS city__id, related_city.name AS city__name " + \
+        "FROM (SELECT first_name, city FROM persons WHERE 1 = 1) AS persons" + \
+        " LEFT JOIN cities AS related_city ON related_city.id = persons.city"
+
+
+@async_decorator
+async def test_find_select_related():
+    persons = await Person.find_all(select_related=['city'])
+    assert [person.first_name for person in persons] == \
+        ['Rich', 'Elton', 'Naruto']
+    assert [person.city.name for person in persons] == ['Konoha'] * 3
+
+    persons = await Person.find_all(
+        fields_includes=['first_name'], select_related=['city'],
+        order_by=['age', '-id_teste'])
+    assert [person.first_name for person in persons] == \
+        ['Naruto', 'Elton', 'Rich']
+    assert [person.city.name for person in persons] == ['Konoha'] * 3
+
+    contact = await Contact.find_one(select_related=['id_person'])
+    assert contact.phone == 'XXXXXXXXX-XXXX'
+    assert contact.id_person.first_name == 'Rich'
+    assert contact.id_person.city.name == 'Konoha'
+
+    with pytest.raises(Exception):
+        await Person.find_all(select_related=['first_name'])
+
+
+@async_decorator
+async def test_iterate():
+    persons = [person async for person in Person.iterate(batch_size=2)]
+    assert [person.first_name for person in persons] == \
+        ['Rich', 'Elton', 'Naruto']
+    assert [person.city.name for person in persons] == ['Konoha'] * 3
+
+    batches = [batch async for batch in Person.iterate(batch_size=2, batches=True)]
+    assert [len(batch) for batch in batches] == [2, 1]
+
+    async for person in Person.iterate(batch_size=1):
+        person = await Person.find_by_id(person.id_teste)
+        assert person.city.name == 'Konoha'
+        break
+
+    persons = [person async for person in Person.iterate(
+        batch_size=2, order_by=['-id_teste'])]
+    assert [person.first_name for person in persons] == \
+        ['Naruto', 'Elton', 'Rich']
+    persons = [person async for person in Person.iterate(
+        batch_size=2, order_by=['-age', 'id_teste'])]
+    assert [person.first_name for person in persons] == \
+        ['Rich', 'Elton', 'Naruto']
+
+    with pytest.raises(ZeroDivisionError):
+        async with db.transaction():
+            await Person.save(Person(
+                first_name='Gaara', last_name='Sabaku', age=16, salary=100))
+            persons = [person async for person in Person.iterate(batch_size=2)]
+            assert [person.first_name for person in persons] == \
+                ['Rich', 'Elton', 'Naruto', 'Gaara']
+            1 / 0
+    assert await Person.count() == 3
+
+
+@async_decorator
+async def test_session_identity_map():
+    async with Session() as session:
+        persons = await Person.find_all()
+        assert persons[0].city is persons[2].city
+        assert await City.find_by_id(city_kh.id) is persons[0].city
+        assert await Person.find_one(conditions=[]) is persons[0]
+        assert session.get(Person, persons[1].id_teste) is persons[1]
+
+        contact = await Contact.find_by_id(persons[0].id_teste)
+        assert contact.id_person is persons[0]
+
+        city = City(name='Hidden Sand')
+        session.add(city)
+        session.add(Contact(phone='8399', id_person=persons[2]))
+        assert session.get(Contact, persons[2].id_teste) is None
+        persons[2].age = 17
+
+    assert city.id is not None
+    person = await Person.find_by_id(persons[2].id_teste)
+    assert person is not persons[2]
+    assert person.age == 17
+    assert (await City.find_by_id(city.id)).name == 'Hidden Sand'
+    contact = await Contact.find_by_id(persons[2].id_teste)
+    assert contact.phone == '8399'
+    await Contact.delete(conditions=[Condition('id_person', '=', persons[2].id_teste)])
+    await City.delete(conditions=[Condition('id', '=', city.id)])
+    await person.update(age=16)
+
+
 @async_decorator
 async def test_save_users():
     global user, user1, user2
@@ -296,6 +449,91 @@ async def test_save_users_working_days():
     assert working_days[2].week_day == 'segunda 2'
 
 
+@async_decorator
+async def test_many_to_many_join():
+    statement_cache.clear()
+    working_days = await user.working_day.get_all(order_by=['-id'], limit=2)
+    assert [working_day.id for working_day in working_days] == [3, 2]
+    sql = next(iter(statement_cache._statements.values()))
+    assert sql == "SELECT working_days.id AS id, " + \
+        "working_days.week_day AS week_day, " + \
+        "working_days.working_date AS working_date FROM working_days " + \
+        "JOIN users_working_days ON users_working_days.working_days = " + \
+        "working_days.id WHERE users_working_days.users = :param_0 " + \
+        "ORDER BY working_days.id DESC LIMIT 2"
+    assert await user.working_day.count() == 3
+
+    users = await working_day.users.get_all(order_by=['name'])
+    assert [user.name for user in users] == ['Rich', 'Rich 1', 'Rich 2']
+    assert await user1.working_day.count() == 1
+
+
+@async_decorator
+async def test_prefetch(queries):
+    cities = await City.find_all(prefetch=['persons'], order_by=['id'])
+    assert len(queries) == 2
+    assert await cities[0].persons.get_all() == []
+    persons = await cities[1].persons.get_all()
+    assert [person.first_name for person in persons] == \
+        ['Rich', 'Elton', 'Naruto']
+    assert persons[0].city is cities[1]
+
+    users = await User.find_all(prefetch=['working_day'], order_by=['id'])
+    assert len(queries) == 4
+    working_days = await users[0].working_day.get_all()
+    assert [working_day.id for working_day in working_days] == [1, 2, 3]
+    assert [len(await user.working_day.get_all()) for user in users[1:]] == \
+        [1, 1]
+    assert len(queries) == 4
+
+    with pytest.raises(Exception):
+        await City.find_all(prefetch=['name'])
+
+
+@async_decorator
+async def test_relation_managers_concurrent():
+    assert user.working_day is user.working_day
+    assert user.working_day is not user1.working_day
+    assert user.working_day.field is User.working_day
+
+    results = await asyncio.gather(
+        user.working_day.get_all(),
+        user1.working_day.get_all(),
+        user2.working_day.count(),
+        City.find_by_id(city_kh.id),
+    )
+    assert [working_day.id for working_day in results[0]] == [1, 2, 3]
+    assert [working_day.id for working_day in results[1]] == [1]
+    assert results[2] == 1
+
+    persons = await asyncio.gather(
+        results[3].persons.get_all(), City(id=0).persons.get_all())
+    assert len(persons[0]) == 3
+    assert persons[1] == []
+
+
+@async_decorator
+async def test_find_all_annotate(queries):
+    cities = await City.find_all(
+        annotate={'n_persons': Count('persons')}, order_by=['id'])
+    assert [city.n_persons for city in cities] == [0, 3]
+    assert queries == [
+        "SELECT id, name, (SELECT COUNT(*) FROM persons WHERE " +
+        "persons.city = cities.id) AS n_persons FROM cities WHERE 1 = 1 " +
+        "ORDER BY id"
+    ]
+
+    users = await User.find_all(
+        annotate={'n_days': Count('working_day')}, order_by=['id'])
+    assert [user.n_days for user in users] == [3, 1, 1]
+    assert 'n_days' not in users[0].get_changed_fields()
+
+    with pytest.raises(Exception):
+        await City.find_all(annotate={'n_names': Count('name')})
+    with pytest.raises(Exception):
+        await City.find_all(annotate={'name': Count('persons')})
+
+
 @async_decorator
 async def test_drop_table():
     await model_manager.drop_all_tables()